@@ -0,0 +1,38 @@
+#A* SCALING BENCHMARK
+#Times DFS, BFS and A* on seeded random boards (20% walls) from 100x100 up
+#to 1000x1000 and prints one line per board size.
+#
+#    python benchmarks/astar_scaling.py [sizes...]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver import ALGORITHMS, Maze
+from solver.generators import random_walls
+
+DENSITY = 0.2
+SEED = 2021
+
+
+def main(argv):
+    sizes = [int(arg) for arg in argv] or [100, 250, 500, 1000]
+    print(f'{"size":>6} ' + ' '.join(f'{name:>10}' for name in ALGORITHMS) + '   path')
+    for size in sizes:
+        grid = random_walls(size, size, DENSITY, seed = SEED)
+        times = []
+        path = None
+        for algorithm in ALGORITHMS.values():
+            maze = Maze(grid, algorithm)
+            began = time.perf_counter()
+            moves = maze.solve(False)
+            times.append(time.perf_counter() - began)
+            if algorithm == ALGORITHMS['astar']:
+                path = len(moves) if moves else None
+        print(f'{size:>6} ' + ' '.join(f'{t:>9.3f}s' for t in times) + f'   {path}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
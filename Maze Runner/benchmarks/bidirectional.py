@@ -0,0 +1,50 @@
+#BIDIRECTIONAL SEARCH BENCHMARK
+#Compares expanded cells and time of BFS/A* with their bidirectional versions on
+#seeded boards of increasing wall density, for a corner-to-corner query and a
+#query between two cells in the middle row.
+#
+#    python benchmarks/bidirectional.py [size]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver import ALGORITHMS, Maze, SolveStats
+from solver.generators import random_walls
+
+DENSITIES = (0.0, 0.2, 0.3)
+PAIRS = (('bfs', 'bibfs'), ('astar', 'biastar'))
+SEED = 2021
+
+
+#TIME AN UNINSTRUMENTED SOLVE, THEN COUNT EXPANSIONS ON A SECOND, IDENTICAL ONE
+def run(grid, name, start, goal):
+    maze = Maze(grid, ALGORITHMS[name], start, goal, seed = SEED)
+    began = time.perf_counter()
+    moves = maze.solve(False)
+    seconds = time.perf_counter() - began
+    stats = SolveStats()
+    Maze(grid, ALGORITHMS[name], start, goal, seed = SEED).solve(False, stats = stats)
+    return stats.expanded, seconds, len(moves) if moves else None
+
+
+def main(argv):
+    size = int(argv[0]) if argv else 500
+    queries = {
+        'corner': (None, None),
+        'middle': ((size // 2, size // 4), (size // 2, 3 * size // 4)),
+    }
+    print(f'{"walls":>6} {"query":>7} {"algorithm":>9} {"expanded":>10} {"time":>9} {"path":>6}')
+    for density in DENSITIES:
+        grid = random_walls(size, size, density, seed = SEED)
+        for query, (start, goal) in queries.items():
+            for pair in PAIRS:
+                for name in pair:
+                    expanded, seconds, path = run(grid, name, start, goal)
+                    print(f'{density:>6.0%} {query:>7} {name:>9} {expanded:>10} {seconds:>8.3f}s {path}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,43 @@
+#FLOOD FILL VS QUEUE FRONTIER BENCHMARK
+#Solves the same seeded boards with the Node-by-Node BFS (QueueFrontier)
+#and the vectorized wavefront BFS, checks both find equally short paths and
+#prints the timings.
+#
+#    python benchmarks/flood_vs_bfs.py [sizes...]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver import ALGORITHMS, Maze
+from solver.generators import random_walls
+
+SEED = 2021
+DENSITIES = (0.0, 0.2)
+
+
+def timed_solve(grid, algorithm):
+    maze = Maze(grid, algorithm)
+    began = time.perf_counter()
+    moves = maze.solve(False)
+    return time.perf_counter() - began, moves
+
+
+def main(argv):
+    sizes = [int(arg) for arg in argv] or [100, 250, 500, 1000]
+    print(f'{"size":>6} {"walls":>6} {"bfs":>10} {"flood":>10} {"speedup":>8}   path')
+    for size in sizes:
+        for density in DENSITIES:
+            grid = random_walls(size, size, density, seed = SEED)
+            bfs_time, bfs_moves = timed_solve(grid, ALGORITHMS['bfs'])
+            flood_time, flood_moves = timed_solve(grid, ALGORITHMS['flood'])
+            if (bfs_moves is None) != (flood_moves is None) or (bfs_moves and len(bfs_moves) != len(flood_moves)):
+                raise SystemExit(f'{size}x{size} at {density:.0%}: BFS and flood fill disagree on the path length')
+            path = len(flood_moves) if flood_moves is not None else None
+            print(f'{size:>6} {density:>6.0%} {bfs_time:>9.3f}s {flood_time:>9.3f}s {bfs_time / flood_time:>7.1f}x   {path}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
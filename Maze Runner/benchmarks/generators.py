@@ -0,0 +1,32 @@
+#GENERATOR BENCHMARK
+#Times every maze generator on square boards and checks that the default
+#start and goal are joined (except for random_walls, which makes no promise).
+#
+#    python benchmarks/generators.py [sizes...]      (default 1001 4001)
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver import ALGORITHMS, Maze
+from solver.generators import GENERATORS
+
+SEED = 2021
+
+
+def main(argv):
+    sizes = [int(size) for size in argv] or [1001, 4001]
+    for size in sizes:
+        for name, generator in GENERATORS.items():
+            began = time.perf_counter()
+            grid = generator(size, size, seed = SEED)
+            seconds = time.perf_counter() - began
+            walls = grid.wall_count() / (size * size)
+            solvable = Maze(grid, ALGORITHMS['flood']).solve(False) is not None
+            print(f'{size}x{size} {name:>11}: {seconds:6.2f}s  {walls:.0%} walls  {"solvable" if solvable else "unsolvable"}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
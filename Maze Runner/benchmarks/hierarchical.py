@@ -0,0 +1,73 @@
+#HPA* BENCHMARK
+#Answers random queries on a random board and a recursive-backtracker maze
+#with exact A* (a fresh Maze per query) and with one HierarchicalPlanner, and
+#reports the setup cost, time per query, how much longer the hierarchical
+#paths are, and how long a solve takes after a few wall edits.
+#
+#    python benchmarks/hierarchical.py [size] [queries] [cluster]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver import ALGORITHMS, Maze
+from solver.generators import backtracker, random_walls
+from solver.hierarchical import HierarchicalPlanner
+
+SEED = 2021
+EDITS = 20
+
+
+def open_cell(grid, rng):
+    while True:
+        state = (rng.randrange(grid.height), rng.randrange(grid.width))
+        if not grid.is_wall(state):
+            return state
+
+
+def main(argv):
+    size = int(argv[0]) if argv else 501
+    count = int(argv[1]) if len(argv) > 1 else 50
+    cluster = int(argv[2]) if len(argv) > 2 else 16
+
+    for name, grid in (('random', random_walls(size, size, 0.3, seed = SEED)), ('backtracker', backtracker(size, size, seed = SEED))):
+        rng = random.Random(SEED)
+        queries = [(open_cell(grid, rng), open_cell(grid, rng)) for _ in range(count)]
+
+        began = time.perf_counter()
+        exact = [Maze(grid, ALGORITHMS['astar'], start, goal).solve(False) for start, goal in queries]
+        per_astar = (time.perf_counter() - began) / count
+
+        began = time.perf_counter()
+        planner = HierarchicalPlanner(grid, cluster)
+        setup = time.perf_counter() - began
+        began = time.perf_counter()
+        found = [planner.solve(start, goal) for start, goal in queries]
+        per_query = (time.perf_counter() - began) / count
+
+        gaps = sorted(len(moves) / len(best) - 1 for moves, best in zip(found, exact) if best)
+        missed = sum((moves is None) != (best is None) for moves, best in zip(found, exact))
+
+        #TOGGLE SOME CELLS, THEN TIME THE FIRST SOLVE (WHICH REBUILDS THE STALE CLUSTERS)
+        for _ in range(EDITS):
+            planner.toggle((rng.randrange(grid.height), rng.randrange(grid.width)))
+        rebuilt = planner.rebuilt
+        began = time.perf_counter()
+        planner.solve(*queries[0])
+        repair = time.perf_counter() - began
+
+        print(f'{name:>11} {size}x{size}, {cluster}x{cluster} clusters: '
+              f'A* {per_astar * 1000:.1f} ms/query, HPA* {setup:.2f}s setup + {per_query * 1000:.1f} ms/query')
+        if gaps:
+            print(f'{"":>11} path length over A*: mean {sum(gaps) / len(gaps):.1%}, '
+                  f'p95 {gaps[int(0.95 * (len(gaps) - 1))]:.1%}, max {gaps[-1]:.1%}'
+                  + (f', {missed} reachability mismatches' if missed else ''))
+        print(f'{"":>11} {EDITS} wall edits: {planner.rebuilt - rebuilt} of {planner.rows * planner.cols} clusters rebuilt, '
+              f'next solve {repair * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,46 @@
+#JUMP POINT SEARCH BENCHMARK
+#Runs A* and Jump Point Search on the same seeded queries over open, sparse
+#and dense boards and prints expanded cells, total time and the path length
+#(which must match).
+#
+#    python benchmarks/jump_points.py [size] [queries]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver import ALGORITHMS, Maze, SolveStats
+from solver.generators import random_walls
+
+BOARDS = (('open', 0.0), ('sparse', 0.05), ('dense', 0.3))
+SEED = 2021
+
+
+def main(argv):
+    size = int(argv[0]) if argv else 1000
+    count = int(argv[1]) if len(argv) > 1 else 10
+    rng = random.Random(SEED)
+    queries = [((rng.randrange(size), rng.randrange(size)), (rng.randrange(size), rng.randrange(size))) for _ in range(count)]
+
+    print(f'{"board":>7} {"algorithm":>9} {"expanded":>10} {"time":>9} {"path":>9}')
+    for board, density in BOARDS:
+        grid = random_walls(size, size, density, seed = SEED)
+        for name in ('astar', 'jps'):
+            expanded = seconds = path = 0
+            for start, goal in queries:
+                maze = Maze(grid, ALGORITHMS[name], start, goal, seed = SEED)
+                began = time.perf_counter()
+                moves = maze.solve(False)
+                seconds += time.perf_counter() - began
+                stats = SolveStats()
+                Maze(grid, ALGORITHMS[name], start, goal, seed = SEED).solve(False, stats = stats)
+                expanded += stats.expanded
+                path += len(moves) if moves else 0
+            print(f'{board:>7} {name:>9} {expanded:>10} {seconds:>8.3f}s {path:>9}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
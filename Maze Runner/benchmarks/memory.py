@@ -0,0 +1,72 @@
+#PEAK MEMORY BENCHMARK
+#Solves the same open board with BFS twice, each in a fresh process: once
+#with the previous Node-object search tree (reproduced below) and once with
+#Maze's flat parent/action arrays, and prints the peak RSS of each.
+#
+#    python benchmarks/memory.py [size]
+
+import os
+import resource
+import subprocess
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver import ALGORITHMS, Grid, Maze
+
+
+#THE PRE-ARRAY SEARCH: ONE Node (WITH A __dict__) PER REACHED CELL
+class LegacyNode():
+    def __init__(self, parent, state, action):
+        self.parent = parent
+        self.state = state
+        self.action = action
+
+
+def legacy_bfs(maze):
+    frontier = deque([LegacyNode(None, maze.start, None)])
+    seen = {maze.start}
+    while frontier:
+        node = frontier.popleft()
+        if node.state == maze.goal:
+            moves = []
+            while node.parent is not None:
+                moves.append(node.state)
+                node = node.parent
+            return moves[::-1]
+        for action, state in maze.find_neighbors(node.state):
+            if state not in seen:
+                seen.add(state)
+                frontier.append(LegacyNode(node, state, action))
+    return None
+
+
+def peak_rss_mb():
+    #ru_maxrss IS KILOBYTES ON LINUX, BYTES ON MACOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+def child(mode, size):
+    maze = Maze(Grid(size, size), ALGORITHMS['bfs'], seed = 0)
+    before = peak_rss_mb()
+    began = time.perf_counter()
+    moves = legacy_bfs(maze) if mode == 'nodes' else maze.solve(False)
+    elapsed = time.perf_counter() - began
+    print(f'{mode:>7} {size:>6} {before:>10.1f} {peak_rss_mb():>10.1f} {elapsed:>8.2f}s {len(moves):>7}')
+
+
+def main(argv):
+    if argv and argv[0] == '--child':
+        return child(argv[1], int(argv[2]))
+
+    size = int(argv[0]) if argv else 1000
+    print(f'{"tree":>7} {"size":>6} {"setup MB":>10} {"peak MB":>10} {"time":>9} {"path":>7}')
+    for mode in ('nodes', 'arrays'):
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, str(size)], check = True)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
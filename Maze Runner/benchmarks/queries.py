@@ -0,0 +1,57 @@
+#MULTI-QUERY BENCHMARK
+#Answers the same stream of (start, goal) queries with a fresh Maze per query
+#and with one QuerySolver, on a random board and a recursive-backtracker
+#maze. Most queries start from a few hub cells, the rest are one-offs.
+#
+#    python benchmarks/queries.py [size] [queries]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver import ALGORITHMS, Maze, QuerySolver
+from solver.generators import backtracker, random_walls
+
+SEED = 2021
+HUBS = 4
+BASELINE = 20
+
+
+def open_cell(grid, rng):
+    while True:
+        state = (rng.randrange(grid.height), rng.randrange(grid.width))
+        if not grid.is_wall(state):
+            return state
+
+
+def main(argv):
+    size = int(argv[0]) if argv else 501
+    count = int(argv[1]) if len(argv) > 1 else 2000
+
+    for name, grid in (('random', random_walls(size, size, 0.3, seed = SEED)), ('backtracker', backtracker(size, size, seed = SEED))):
+        rng = random.Random(SEED)
+        hubs = [open_cell(grid, rng) for _ in range(HUBS)]
+        queries = [(rng.choice(hubs) if rng.random() < 0.8 else open_cell(grid, rng), open_cell(grid, rng)) for _ in range(count)]
+
+        began = time.perf_counter()
+        for start, goal in queries[:BASELINE]:
+            Maze(grid, ALGORITHMS['astar'], start, goal).solve(False)
+        per_maze = (time.perf_counter() - began) / BASELINE
+
+        began = time.perf_counter()
+        solver = QuerySolver(grid)
+        setup = time.perf_counter() - began
+        began = time.perf_counter()
+        unreachable = sum(moves is None for _, moves in solver.stream(queries))
+        per_query = (time.perf_counter() - began) / count
+
+        print(f'{name:>11} {size}x{size}: Maze + A* {per_maze * 1000:.2f} ms/query, '
+              f'QuerySolver {setup:.3f}s setup + {per_query * 1000:.3f} ms/query '
+              f'({solver.components} components, {unreachable}/{count} unreachable)')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
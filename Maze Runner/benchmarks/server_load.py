@@ -0,0 +1,127 @@
+#LOAD GENERATOR FOR solver.server
+#Opens several connections, keeps a fixed number of requests in flight on
+#each and reports throughput and latency percentiles. Boards are random
+#walls, generated and packed once up front so the client stays cheap.
+#
+#    python benchmarks/server_load.py --spawn --requests 2000 --size 101
+#    python benchmarks/server_load.py --port 8765 --connections 8 --concurrency 16
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver.generators import random_walls
+
+SEED = 2021
+BOARDS = 32
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def connection(args, lines, counter, latencies, errors):
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix, limit = 2**26)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port, limit = 2**26)
+    sent = {}
+    window = asyncio.Semaphore(args.concurrency)
+
+    #THE SERVER CLOSES THE CONNECTION ONCE IT HAS ANSWERED EVERYTHING SENT BEFORE THE EOF
+    async def send():
+        while True:
+            await window.acquire()
+            if counter[0] >= args.requests:
+                break
+            index = counter[0]
+            counter[0] += 1
+            sent[index] = time.perf_counter()
+            writer.write(lines[index % len(lines)].replace(b'"id":0', b'"id":%d' % index, 1))
+            await writer.drain()
+        writer.write_eof()
+
+    async def receive():
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            reply = json.loads(line)
+            began = sent.pop(reply['id'], None)
+            if began is not None:
+                latencies.append(time.perf_counter() - began)
+            if 'error' in reply:
+                errors[reply['error']] = errors.get(reply['error'], 0) + 1
+            window.release()
+
+    sender = asyncio.create_task(send())
+    await receive()
+    await sender
+    writer.close()
+
+
+async def run(args):
+    lines = []
+    for seed in range(BOARDS):
+        grid = random_walls(args.size, args.size, args.density, seed = SEED + seed)
+        request = {'id': 0, 'height': grid.height, 'width': grid.width, 'walls': base64.b64encode(grid.pack()).decode(),
+                   'algorithm': args.algorithm, 'deadline_ms': args.deadline_ms}
+        lines.append(json.dumps(request, separators = (',', ':')).encode() + b'\n')
+
+    counter, latencies, errors = [0], [], {}
+    began = time.perf_counter()
+    await asyncio.gather(*(connection(args, lines, counter, latencies, errors) for _ in range(args.connections)))
+    elapsed = time.perf_counter() - began
+
+    latencies.sort()
+    print(f'{args.requests} requests, {args.size}x{args.size} boards, {args.algorithm}, '
+          f'{args.connections} connections x {args.concurrency} in flight')
+    print(f'throughput {len(latencies) / elapsed:,.0f} replies/s over {elapsed:.2f}s')
+    if latencies:
+        print('latency ms  ' + '  '.join(f'{name} {percentile(latencies, fraction) * 1000:.1f}'
+                                         for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))))
+    for error, count in sorted(errors.items()):
+        print(f'{count} x {error}')
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description = 'Measure throughput and latency of solver.server.')
+    parser.add_argument('--host', default = '127.0.0.1')
+    parser.add_argument('--port', type = int, default = 8765)
+    parser.add_argument('--unix', metavar = 'PATH')
+    parser.add_argument('--spawn', action = 'store_true', help = 'start a server for the run and stop it afterwards')
+    parser.add_argument('--workers', type = int, help = 'server workers with --spawn')
+    parser.add_argument('--requests', type = int, default = 2000)
+    parser.add_argument('--connections', type = int, default = 4)
+    parser.add_argument('--concurrency', type = int, default = 16, help = 'requests in flight per connection')
+    parser.add_argument('--size', type = int, default = 101)
+    parser.add_argument('--density', type = float, default = 0.3)
+    parser.add_argument('--algorithm', default = 'astar')
+    parser.add_argument('--deadline-ms', type = int, default = 5000)
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        command = [sys.executable, '-m', 'solver.server']
+        command += ['--unix', args.unix] if args.unix else ['--host', args.host, '--port', str(args.port)]
+        command += ['--workers', str(args.workers)] if args.workers else []
+        server = subprocess.Popen(command, cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__))), stdout = subprocess.PIPE, text = True)
+        print(server.stdout.readline().strip())
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.send_signal(signal.SIGINT)
+            print(server.communicate()[0].strip())
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,123 @@
+#SOLVER BENCHMARK SUITE
+#Generates a reproducible corpus (open fields, random walls at several
+#densities and recursive-backtracker, Kruskal and Prim mazes) at several sizes, solves each board
+#corner to corner with every algorithm and writes one JSON record per run:
+#wall time, expanded/generated/requeued cells, peak frontier size, time per
+#solver phase, peak memory and path length.
+#
+#    python benchmarks/suite.py -o results.json
+#    python benchmarks/suite.py --sizes 101 501 --algorithms astar jps --repeat 5
+#    python benchmarks/suite.py --profile solve.prof   (then python -m pstats solve.prof)
+#
+#Times are the best of --repeat uninstrumented solves and do not include
+#building the Maze (with --profile they include the profiler's overhead).
+#Counters and phase times come from one more solve with a SolveStats, and
+#peak memory from a last, untimed run under tracemalloc that covers building
+#the Maze and solving it.
+
+import argparse
+import cProfile
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver import ALGORITHMS, Maze, SolveStats
+from solver.generators import backtracker, kruskal, open_field, prim, random_walls
+
+SIZES = (101, 251, 501)
+DENSITIES = (0.1, 0.2, 0.3)
+SEED = 2021
+
+
+#(KIND, DENSITY, Grid) FOR EVERY BOARD OF ONE SIZE
+def corpus(size, densities, seed):
+    yield 'open', 0.0, open_field(size, size)
+    for density in densities:
+        yield 'random', density, random_walls(size, size, density, seed = seed)
+    yield 'backtracker', None, backtracker(size, size, seed = seed)
+    yield 'kruskal', None, kruskal(size, size, seed = seed)
+    yield 'prim', None, prim(size, size, seed = seed)
+
+
+def measure(grid, algorithm, repeat, seed, profiler = None):
+    best = None
+    for _ in range(repeat):
+        maze = Maze(grid, algorithm, seed = seed)
+        if profiler is not None:
+            profiler.enable()
+        began = time.perf_counter()
+        moves = maze.solve(False)
+        seconds = time.perf_counter() - began
+        if profiler is not None:
+            profiler.disable()
+        best = seconds if best is None else min(best, seconds)
+
+    stats = SolveStats()
+    Maze(grid, algorithm, seed = seed).solve(False, stats = stats)
+
+    tracemalloc.start()
+    Maze(grid, algorithm, seed = seed).solve(False)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'seconds': round(best, 6),
+        'expanded': stats.expanded,
+        'generated': stats.generated,
+        'requeued': stats.requeued,
+        'max_frontier': stats.max_frontier,
+        'phases': {phase: round(seconds, 6) for phase, seconds in stats.timings.items()},
+        'peak_memory': peak,
+        'path_length': len(moves) if moves is not None else None,
+    }
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Benchmark every solver on a generated maze corpus')
+    parser.add_argument('--sizes', type = int, nargs = '+', default = list(SIZES))
+    parser.add_argument('--densities', type = float, nargs = '+', default = list(DENSITIES))
+    parser.add_argument('--algorithms', nargs = '+', choices = list(ALGORITHMS), default = list(ALGORITHMS))
+    parser.add_argument('--repeat', type = int, default = 3, help = 'solves per run; the fastest is reported')
+    parser.add_argument('--seed', type = int, default = SEED)
+    parser.add_argument('-o', '--output', help = 'write the JSON report here instead of stdout')
+    parser.add_argument('--profile', metavar = 'FILE', help = 'save cProfile stats of all timed solves to FILE')
+    args = parser.parse_args(argv)
+
+    profiler = cProfile.Profile() if args.profile else None
+    runs = []
+    for size in args.sizes:
+        for kind, density, grid in corpus(size, args.densities, args.seed):
+            for name in args.algorithms:
+                result = measure(grid, ALGORITHMS[name], args.repeat, args.seed, profiler)
+                runs.append({'board': kind, 'size': size, 'density': density, 'algorithm': name, **result})
+                print(f'{kind:>11} {size:>5} {density if density is not None else "":>4} {name:>8} {result["seconds"]:>9.4f}s', file = sys.stderr)
+
+    report = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'runs': runs,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent = 1)
+    else:
+        json.dump(report, sys.stdout, indent = 1)
+        print()
+
+    if profiler is not None:
+        profiler.dump_stats(args.profile)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,169 +2,22 @@
 #Made by Garreth Lee (2021)
 
 import pygame
-import random
-import time
+import threading
 import sys
+from functools import lru_cache
 from pygame.draw import rect
 from pygame.constants import MOUSEBUTTONDOWN
 
+from solver import ALGORITHMS, IncrementalPlanner, SolutionCache, mazefile
+from solver.generators import GENERATORS
 
-##################### CLASSES #######################
-
-#NODE IN FRONTIER
-class Node():
-    def __init__(self, parent, state, action):
-        self.parent = parent #node
-        self.state = state #tuple
-        self.action = action #tuple
-
-#DEPTH FIRST SEARCH (DFS)
-class StackFrontier():
-    def __init__(self):
-        self.frontier = []
-        
-    def add(self, node):
-        self.frontier.append(node)
-
-    def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
-
-    def empty(self):
-        return len(self.frontier) == 0
-
-    def remove(self):
-        if self.empty():
-            raise Exception('Frontier already empty!')
-        else:
-            node = self.frontier[-1]
-            self.frontier.remove(node)
-            return [node]
-
-#BREADTH FIRST SEARCH (BFS)
-class QueueFrontier(StackFrontier):
-    def remove(self):
-        if self.empty():
-            raise Exception('Frontier already empty!')
-        else:
-            node = self.frontier[0] 
-            self.frontier.remove(node)
-            return [node]
-
-#A* SEARCH FRONTIER (MANHATTAN DISTANCE HEURISTIC FUNCTION)
-class ManhattanFrontier(StackFrontier):
-    def remove(self, cost):
-        if self.empty():
-            raise Exception('Frontier already empty!')
-        else:
-            best_neighbor = set()
-            best_neighbor_cost = 0
-            for node in self.frontier:
-                x,y = node.state
-                absolute_cost = cost + abs(x-9) + abs(y-9)
-                if len(best_neighbor) == 0 or absolute_cost < best_neighbor_cost:
-                    best_neighbor = {node}
-                    best_neighbor_cost = absolute_cost
-                elif absolute_cost == best_neighbor_cost:
-                    best_neighbor.add(node)
-
-            for neighbor in best_neighbor:
-                self.frontier.remove(neighbor)
-
-            return best_neighbor
-
-#MAZE OBJECT
-class Maze():
-    def __init__(self, board, algorithm):
-        self.board = board
-        self.start = (0,0)
-        self.goal = (9,9)
-        self.algorithm = algorithm
-        self.walls = []
-        self.height = self.width = len(self.board)
-
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                if self.board[i][j] and (i,j) not in (self.start, self.goal):
-                    row.append(True)
-                else:
-                    row.append(False)
-            self.walls.append(row)
-
-
-    def find_neighbors(self, state):
-
-        self.neighbors = []
-
-        x,y = state
-
-        possible_actions = [
-            ('down', (x, y+1)),
-            ('right', (x+1, y)),
-            ('up', (x, y-1)),
-            ('left', (x-1, y))
-        ]
-
-        random.shuffle(possible_actions)
-
-        for action, result in possible_actions:
-            x, y = result
-            try:
-                if not self.walls[x][y] and (0 <= x < self.width) and (0 <= y < self.height):
-                    self.neighbors.append((action, result))
-            except IndexError:
-                continue
-
-        return self.neighbors
-
-    def solve(self, show_steps):
-
-        self.cost = 0
-        
-        self.cells = list() if show_steps else set()
-
-        start = Node(parent = None, state = self.start, action = None)
-
-        if self.algorithm == 1:
-            frontier = StackFrontier()
-        elif self.algorithm == 2:
-            frontier = QueueFrontier()
-        elif self.algorithm == 3:
-            frontier = ManhattanFrontier()
-
-        frontier.add(start)
-        
-        while True:
-            if frontier.empty():
-                return None
-
-            self.cost += 1
-
-            nodes = frontier.remove(self.cost) if self.algorithm == 3 else frontier.remove()
-
-            for node in nodes:
-
-                if self.goal == node.state:
-                    moves = []
-                    while node.parent != None:
-                        moves.append(node.state)
-                        node = node.parent
-                    moves.reverse()
-                    if show_steps:
-                        return (self.cells, moves)
-                    else:
-                        return moves
-
-                if show_steps and node.state not in self.cells:
-                    self.cells.append(node.state)
-                if not show_steps:
-                    self.cells.add(node.state)
 
+##################### CLASSES #######################
 
-                for action, state in self.find_neighbors(node.state):
-                    if not frontier.contains_state(self.goal) and state not in self.cells:
-                        child = Node(parent = node, state = state, action = action)
-                        frontier.add(child)
+#TEXT IS RENDERED ONCE PER (font, text, color) AND REUSED
+@lru_cache(maxsize = 256)
+def render_text(font, text, color):
+    return font.render(text, 1, color)
 
 #DROPDOWN MENU FOR ALGORITHM SELECTION
 class DropDown():
@@ -173,17 +26,25 @@ class DropDown():
         self.color = color
         self.highlight_color = highlight_color
         self.rect = pygame.Rect(x,y,w,h)
+        self.area = pygame.Rect(x,y,w,h * (len(options) + 1))
         self.font = font
         self.options = options
         self.selected = selected
         self.draw_menu = False
         self.menu_active = False
         self.active_option = -1
+        self.drawn_state = None
     
+    #ONLY REPAINTS WHEN SOMETHING VISIBLE CHANGED; RETURNS THE DIRTY RECT OR None
     def draw(self, surface):
+        state = (self.menu_active, self.draw_menu, self.active_option, self.selected)
+        if state == self.drawn_state:
+            return None
+        self.drawn_state = state
+
         pygame.draw.rect(surface, self.highlight_color if self.menu_active else self.color, self.rect)
         pygame.draw.rect(surface, (0,0,0), self.rect, 2) #border
-        msg = self.font.render(self.options[self.selected], 1, (0,0,0))
+        msg = render_text(self.font, self.options[self.selected], (0,0,0))
         surface.blit(msg, msg.get_rect(center = self.rect.center))
 
         if self.draw_menu:
@@ -195,7 +56,7 @@ class DropDown():
                 else:
                     pygame.draw.rect(surface, self.highlight_color if i == self.active_option else self.color, rect)
 
-                msg = self.font.render(text, 1, (0,0,0))
+                msg = render_text(self.font, text, (0,0,0))
                 surface.blit(msg, msg.get_rect(center = rect.center))
             outer_rect = (self.rect.x, self.rect.y + self.rect.height, self.rect.width, self.rect.height * (len(self.options)))
             pygame.draw.rect(surface, (0,0,0), outer_rect, 2) 
@@ -206,6 +67,7 @@ class DropDown():
                 rect.y += (i+1) * self.rect.height
                 pygame.draw.rect(surface, (0,0,0), rect)
 
+        return self.area
 
         
     def update(self, events):
@@ -245,15 +107,22 @@ class Checkbox():
         self.filled_color = (0,0,0)
         self.empty_color = (255,255,255)
         self.text = text
+        self.drawn_state = None
 
+    #ONLY REPAINTS WHEN SOMETHING VISIBLE CHANGED; RETURNS THE DIRTY RECT OR None
     def draw(self, surface):
+        state = (self.hovered, self.selected)
+        if state == self.drawn_state:
+            return None
+        self.drawn_state = state
+
         pygame.draw.rect(surface, self.empty_color, self.rect)
         if self.hovered:
             pygame.draw.rect(surface, self.filled_color, self.fill_rect)
         if self.selected:
             pygame.draw.rect(surface, self.filled_color, self.fill_rect)
-        msg = self.font.render(self.text, 1, (255,255,255))
-        surface.blit(msg, (self.rect.x + 30, self.rect.y + 2.5))
+        msg = render_text(self.font, self.text, (255,255,255))
+        return self.rect.union(surface.blit(msg, (self.rect.x + 30, self.rect.y + 2.5)))
         
 
     def update(self, events):
@@ -274,6 +143,69 @@ class Checkbox():
         return self.selected
         
 
+#RAISED INSIDE THE SEARCH TO STOP A CANCELLED SolveJob
+class Cancelled(Exception):
+    pass
+
+#RUNS A SOLVE ON A BACKGROUND THREAD SO THE WINDOW KEEPS RESPONDING; solve GETS show_steps
+#(FIXED WHEN THE JOB STARTS, SO THE RESULT'S SHAPE DOES NOT FOLLOW LATER CHECKBOX CLICKS) AND AN
+#on_expand CALLBACK THAT STOPS THE SEARCH AT ITS NEXT EXPANSION ONCE cancel() IS CALLED.
+#A SOLVE THAT RAISES STILL FINISHES THE JOB, WITH THE EXCEPTION IN error
+class SolveJob():
+    def __init__(self, solve, *args, show_steps = False):
+        self.result = None
+        self.error = None
+        self.done = False
+        self.cancelled = False
+        self.show_steps = show_steps
+        self.thread = threading.Thread(target = self.run, args = (solve,) + args, daemon = True)
+        self.thread.start()
+
+    def run(self, solve, *args):
+        try:
+            self.result = solve(*args, show_steps = self.show_steps, on_expand = self.check)
+        except Cancelled:
+            return
+        except Exception as error:
+            self.error = error
+        self.done = True
+
+    def check(self, state):
+        if self.cancelled:
+            raise Cancelled()
+
+    def cancel(self):
+        self.cancelled = True
+
+#PAINTS (cell, color) PAIRS A FEW AT A TIME, speed CELLS PER SECOND
+class Animation():
+    def __init__(self, cells, speed, draw):
+        self.cells = cells
+        self.speed = speed
+        self.draw = draw
+        self.shown = 0
+        self.elapsed = 0.0
+
+    def done(self):
+        return self.shown >= len(self.cells)
+
+    #DRAWS THE CELLS DUE AFTER dt MORE SECONDS
+    def advance(self, dt):
+        self.elapsed += dt
+        due = min(len(self.cells), self.shown + int(self.elapsed * self.speed))
+        if due > self.shown:
+            self.elapsed -= (due - self.shown) / self.speed
+        self.show(due)
+
+    def finish(self):
+        self.show(len(self.cells))
+
+    def show(self, due):
+        for cell, color in self.cells[self.shown:due]:
+            self.draw(*cell, color)
+        self.shown = due
+        
+
 ################# PROGRAM #####################
 
 size = (900,600)
@@ -294,29 +226,184 @@ pygame.display.set_caption('Algorithmic Maze Runner')
 
 running = True
 cursor_drag = False
-board_drawn = False
-algo_list_drawn = False
 homepage = True
 checkbox_filled = False
 
 algorithm = 0
 
+#ANIMATION: CELLS PER SECOND (UP/DOWN ARROWS DOUBLE/HALVE IT), SPACE SKIPS
+#TO THE END AND ESCAPE CANCELS
+FPS = 60
+animation_speed = 10
+solve_job = None
+animation = None
+clock = pygame.time.Clock()
+
+#SCREEN AREAS CHANGED THIS FRAME; ONLY THESE ARE PUSHED TO THE DISPLAY
+dirty = []
+
+#BOARD SIZE: python main.py [rows [cols]] (DEFAULT 10x10), OR python main.py board.maze
+#TO OPEN A SAVED BOARD. THE SAVE AND LOAD BUTTONS USE THAT FILE (board.maze BY DEFAULT)
+#THE BOARD ALWAYS FITS IN A 500x500 AREA, CELLS SHRINK AS THE BOARD GROWS
+ARGS = sys.argv[1:]
+OPEN_FILE = ARGS.pop(0) if ARGS and ARGS[0].endswith('.maze') else None
+BOARD_FILE = OPEN_FILE or 'board.maze'
+BOARD_X, BOARD_Y, BOARD_PX = 50, 50, 500
+
+def resize_board(rows, cols, start = None, goal = None):
+    global BOARD_ROWS, BOARD_COLS, START, GOAL, CELL_PX, CELL_BORDER
+    BOARD_ROWS, BOARD_COLS = rows, cols
+    START = (0,0) if start is None else start
+    GOAL = (rows-1, cols-1) if goal is None else goal
+    CELL_PX = BOARD_PX // max(BOARD_ROWS, BOARD_COLS)
+    CELL_BORDER = 3 if CELL_PX >= 20 else 1 if CELL_PX >= 6 else 0
+
+ROWS = int(ARGS[0]) if ARGS else 10
+resize_board(ROWS, int(ARGS[1]) if len(ARGS) > 1 else ROWS)
+
+def cell_rect(i, j):
+    left = BOARD_X + j * BOARD_PX // BOARD_COLS
+    top = BOARD_Y + i * BOARD_PX // BOARD_ROWS
+    right = BOARD_X + (j+1) * BOARD_PX // BOARD_COLS
+    bottom = BOARD_Y + (i+1) * BOARD_PX // BOARD_ROWS
+    return pygame.Rect(left, top, max(right - left, 1), max(bottom - top, 1))
+
+#(ROW, COL) UNDER A PIXEL POSITION, OR None OFF THE BOARD
+def cell_at(pos):
+    x,y = pos
+    if not (BOARD_X <= x < BOARD_X + BOARD_PX and BOARD_Y <= y < BOARD_Y + BOARD_PX):
+        return None
+    return ((y - BOARD_Y) * BOARD_ROWS // BOARD_PX, (x - BOARD_X) * BOARD_COLS // BOARD_PX)
+
+def draw_cell(i, j, color):
+    box = cell_rect(i, j)
+    pygame.draw.rect(screen, color, box)
+    if CELL_BORDER:
+        pygame.draw.rect(screen, ORANGE, box, CELL_BORDER)
+    dirty.append(box)
+
 def draw_board():
-    for row in range(1,11):
+    for i in range(BOARD_ROWS):
         boxes = []
-        for col in range(1,11):
-            box = pygame.Rect(50*row,50*col,50,50)
-            if (row, col) not in ((1,1),(10,10)):
-                pygame.draw.rect(screen, ORANGE, box, 3)
-            else:
-                pygame.draw.rect(screen, RED, box)
-                pygame.draw.rect(screen, ORANGE, box, 3)
+        for j in range(BOARD_COLS):
+            draw_cell(i, j, RED if (i,j) in (START, GOAL) else BLACK)
             boxes.append(False)
-            coordinates.append((50*row,50*col))
         board.append(boxes)
 
 board = []
-coordinates = []
+
+#CELLS COLORED BY THE LAST SOLVE (STEPS OR PATH), SO CLEARING THEM DOES NOT
+#MEAN REPAINTING THE WHOLE BOARD
+painted = set()
+
+def mark_cell(i, j, color):
+    painted.add((i,j))
+    draw_cell(i, j, color)
+
+def clear_marks():
+    for i,j in painted:
+        if not board[i][j]:
+            draw_cell(i, j, BLACK)
+    painted.clear()
+
+#SOLVING AN UNCHANGED BOARD AGAIN IS A CACHE HIT
+solutions = SolutionCache()
+
+#AFTER A SOLVE, WALL EDITS REPAIR THE PATH INCREMENTALLY INSTEAD OF RE-SOLVING. THE PLANNER
+#ALWAYS FINDS A SHORTEST PATH, SO THIS IS ONLY DONE AFTER THE ALGORITHMS THAT FIND ONE TOO
+#(NOT DFS). live_path IS THE PATH SHOWN, OR None WHEN EDITS DO NOT UPDATE IT; planner IS BUILT
+#ON THE FIRST EDIT THAT NEEDS IT AND FOLLOWS EVERY EDIT AFTER THAT, SO LATER SOLVES OF THE
+#SAME BOARD KEEP USING IT
+SHORTEST_PATHS = set(ALGORITHMS.values()) - {ALGORITHMS['dfs']}
+planner = None
+live_path = None
+solved_algorithm = None
+
+#SAVE THE BOARD TO BOARD_FILE, OR REPLACE IT WITH THE ONE SAVED THERE (ANY SIZE UP TO
+#ONE PIXEL PER CELL; THE START AND GOAL COME FROM THE FILE TOO). load_board RETURNS
+#WHETHER IT DID, AND LEAVES THE BOARD AS IT WAS IF NOT
+def save_board():
+    try:
+        mazefile.save(BOARD_FILE, board, START, GOAL)
+    except OSError as error:
+        pygame.display.set_caption(f'Could not save {BOARD_FILE}: {error}')
+    else:
+        pygame.display.set_caption(f'Saved {BOARD_FILE}')
+
+def load_board():
+    try:
+        grid, start, goal = mazefile.load(BOARD_FILE)
+    except (OSError, ValueError) as error:
+        pygame.display.set_caption(f'Could not load {BOARD_FILE}: {error}')
+        return False
+    if max(grid.height, grid.width) > BOARD_PX:
+        pygame.display.set_caption(f'{BOARD_FILE} is too large to show ({grid.height}x{grid.width})')
+        return False
+
+    show_grid(grid, start, goal)
+    pygame.display.set_caption(f'Loaded {BOARD_FILE}')
+    return True
+
+#EACH PRESS OF GENERATE FILLS THE BOARD WITH A NEW MAZE OF THE NEXT KIND IN MAZE_KINDS
+MAZE_KINDS = ['backtracker', 'kruskal', 'prim', 'density']
+mazes_generated = 0
+
+def generate_board():
+    global mazes_generated
+    kind = MAZE_KINDS[mazes_generated % len(MAZE_KINDS)]
+    mazes_generated += 1
+    show_grid(GENERATORS[kind](BOARD_ROWS, BOARD_COLS))
+    pygame.display.set_caption(f'Generated a {kind} maze (Generate again for {MAZE_KINDS[mazes_generated % len(MAZE_KINDS)]})')
+
+#REPLACE THE BOARD WITH A Grid'S WALLS, RESIZING IT TO MATCH
+def show_grid(grid, start = None, goal = None):
+    global planner, live_path
+    planner = None
+    live_path = None
+    painted.clear()
+    stop_solving()
+    resize_board(grid.height, grid.width, start, goal)
+    draw_game()
+    for i, row in enumerate(grid.to_board()):
+        for j, wall in enumerate(row):
+            if wall and (i,j) not in (START, GOAL):
+                board[i][j] = True
+                draw_cell(i, j, PURPLE)
+
+#THE BOARD CANNOT BE EDITED WHILE A SOLVE IS RUNNING OR ANIMATING
+def busy():
+    return solve_job is not None or animation is not None
+
+def stop_solving():
+    global solve_job, animation
+    if solve_job is not None:
+        solve_job.cancel()
+    solve_job = None
+    animation = None
+    pygame.display.set_caption('Algorithmic Maze Runner')
+
+#PAINT (wall = True) OR ERASE A WALL, UPDATING THE LIVE PATH IF THERE IS ONE
+def paint_cell(i, j, wall):
+    global planner, live_path
+    draw_cell(i, j, PURPLE if wall else BLACK)
+    if board[i][j] == wall:
+        return
+    if live_path is not None and planner is None:
+        planner = IncrementalPlanner(board, START, GOAL)
+    board[i][j] = wall
+
+    if planner is not None:
+        planner.set_wall((i,j), wall)
+    if live_path is not None:
+        moves = planner.solve()
+        path = set(moves or ()) - {START, GOAL}
+        for x,y in live_path - path:
+            if not board[x][y]:
+                draw_cell(x, y, BLACK)
+        for x,y in path - live_path:
+            mark_cell(x, y, GREEN)
+        live_path = path
+        show_message('Unsolvable!', (600,535), moves is None)
 
 
 
@@ -325,13 +412,89 @@ BTN_TEXT = pygame.font.SysFont('segoeuisemibold', 22)
 
 
 reset_button = pygame.Rect(600,100,100,50)
-algo_list = DropDown(600,200,190,40, WHITE, (100,200,255), BTN_TEXT, ['Pick an Algorithm','DFS','BFS','A* Search'])
+save_button = pygame.Rect(710,100,80,50)
+load_button = pygame.Rect(800,100,80,50)
+algo_list = DropDown(600,160,190,25, WHITE, (100,200,255), BTN_TEXT, ['Pick an Algorithm','DFS','BFS','A* Search','BFS (Flood Fill)','Bidirectional BFS','Bidirectional A*','Jump Point Search'])
 solve_button = pygame.Rect(600,475,100,50)
+generate_button = pygame.Rect(710,475,120,50)
 checkbox = Checkbox(pygame.Rect(600,425,25,25), 'Show steps taken', BTN_TEXT)
 play_button = pygame.Rect(w/2-50,350,100,50)
 
+#MESSAGES ARE SHOWN IN RED AND HIDDEN BY DRAWING THEM AGAIN IN BLACK
+def show_message(text, pos, visible):
+    dirty.append(screen.blit(render_text(BTN_TEXT, text, RED if visible else BLACK), pos))
+
+def draw_homepage():
+    #TITLE
+    title = render_text(LARGE_TEXT, "Algorithmic Maze Runner", WHITE)
+    title_rect = title.get_rect()
+    title_rect.center = (w/2, 80)
+    screen.blit(title, title_rect)
+
+    #INSTRUCTIONS
+    instructions = [
+        'Click the cells to make walls',
+        'Right-click to erase walls',
+        'Pick an algorithm to run',
+        'Check "Show Steps Taken" to see the algorithm in action!',
+        'Or press Generate for a ready-made maze'
+    ]
+
+    for i, text in enumerate(instructions):
+        line = render_text(BTN_TEXT, text, WHITE)
+        line_rect = line.get_rect()
+        line_rect.center = (w/2, 150 + i*40)
+        screen.blit(line, line_rect)
+
+    #PLAY BUTTON
+    pygame.draw.rect(screen, WHITE, play_button)
+    play = render_text(BTN_TEXT, 'PLAY', BLACK)
+    screen.blit(play, (play_button.x + 25, play_button.y + 12.5))
+
+    dirty.append(screen.get_rect())
+
+#EMPTY BOARD AND CONTROLS, DRAWN WHEN ENTERING THE BOARD SCREEN AND ON RESET
+def draw_game():
+    screen.fill(BLACK)
+    board.clear()
+    draw_board()
+
+    #draws the reset button
+    pygame.draw.rect(screen, WHITE, reset_button)
+    screen.blit(render_text(BTN_TEXT, "Reset", BLACK), (reset_button.x + 22.5, reset_button.y + 12.5))
+
+    #draws the save and load buttons
+    for button, text in ((save_button, 'Save'), (load_button, 'Load')):
+        pygame.draw.rect(screen, WHITE, button)
+        screen.blit(render_text(BTN_TEXT, text, BLACK), (button.x + 17.5, button.y + 12.5))
+
+    #draws the solve and generate buttons
+    pygame.draw.rect(screen, WHITE, solve_button)
+    screen.blit(render_text(BTN_TEXT, 'Solve', BLACK), (solve_button.x + 22.5, solve_button.y + 12.5))
+    pygame.draw.rect(screen, WHITE, generate_button)
+    screen.blit(render_text(BTN_TEXT, 'Generate', BLACK), (generate_button.x + 17.5, generate_button.y + 12.5))
+
+    algo_list.drawn_state = checkbox.drawn_state = None
+    dirty[:] = [screen.get_rect()]
+
+draw_homepage()
+
 while running:  
-    events = pygame.event.get()
+    #SLEEP UNTIL THE NEXT EVENT WHEN IDLE; KEEP FRAMES COMING WHILE SOLVING OR ANIMATING
+    if busy():
+        events = pygame.event.get()
+    else:
+        events = [pygame.event.wait()] + pygame.event.get()
+
+    if not homepage:
+        #DROPDOWN MENU
+        selected_option = algo_list.update(events)
+        if selected_option > 0:
+            algorithm = selected_option
+
+        #CHECKBOX MENU
+        checkbox_filled = checkbox.update(events)
+
     for event in events:
 
         #QUIT PROGRAM
@@ -341,209 +504,127 @@ while running:
 
         #HOME PAGE
         if homepage:
-            #TITLE
-            title = LARGE_TEXT.render("Algorithmic Maze Runner", 1, WHITE)
-            title_rect = title.get_rect()
-            title_rect.center = (w/2, 80)
-            screen.blit(title, title_rect)
-
-            #INSTRUCTIONS
-            instructions = [
-                'Click the cells to make walls',
-                'Right-click to erase walls',
-                'Pick an algorithm to run',
-                'Check "Show Steps Taken" to see the algorithm in action!'
-                '',
-                'Note: Avoid placing too little walls for the BFS algorithm!'
-            ]
-
-            for i, text in enumerate(instructions):
-                line = BTN_TEXT.render(text, 1, WHITE)
-                line_rect = line.get_rect()
-                line_rect.center = (w/2, 150 + i*40)
-                screen.blit(line, line_rect)
-
-            #PLAY BUTTON
-            pygame.draw.rect(screen, WHITE, play_button)
-            play = BTN_TEXT.render('PLAY', 1, BLACK)
-            screen.blit(play, (play_button.x + 25, play_button.y + 12.5))
-
-            mpos = pygame.mouse.get_pos()
-
-            if play_button.collidepoint(mpos):
-                if event.type == MOUSEBUTTONDOWN and event.button == 1:
-                    homepage = False
-                    screen.fill(BLACK)
-                
+            if event.type == MOUSEBUTTONDOWN and event.button == 1 and play_button.collidepoint(pygame.mouse.get_pos()):
+                homepage = False
+                #AN EMPTY BOARD IF THERE IS NO FILE TO OPEN OR IT CANNOT BE LOADED
+                if not (OPEN_FILE and load_board()):
+                    draw_game()
+            continue
+
+        #IF MOUSE IS PRESSED
+        if event.type == pygame.MOUSEBUTTONDOWN:
             
-        else:
-
-            #DRAWS THE EMPTY BOARD
-            if not board_drawn:
-                draw_board()
-                board_drawn = True
+            cursor_drag = True
+            button = event.button
+            mousePos = pygame.mouse.get_pos()
 
-            #draws the reset button
-            pygame.draw.rect(screen, WHITE, reset_button)
-            reset_button_text = BTN_TEXT.render("Reset", 1, (BLACK))
-            screen.blit(reset_button_text, (reset_button.x + 22.5, reset_button.y + 12.5))
+            #SOLVE BUTTON
+            if solve_button.collidepoint(mousePos) and not busy():
 
-            #draws the solve button
-            pygame.draw.rect(screen, WHITE, solve_button)
-            solve_button_text = BTN_TEXT.render('Solve',1,BLACK)
-            screen.blit(solve_button_text, (solve_button.x + 22.5, solve_button.y + 12.5))
-            
-            #DROPDOWN MENU
-            selected_option = algo_list.update(events)
-            if selected_option > 0:
-                algorithm = selected_option
-            algo_list.draw(screen)
-
-            #CHECKBOX MENU
-            checkbox_filled = checkbox.update(events)
-            checkbox.draw(screen)
-
-            #IF MOUSE IS PRESSED
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                
-                cursor_drag = True
-                button = event.button
-                mousePos = pygame.mouse.get_pos()
-
-                #SOLVE BUTTON
-                if solve_button.collidepoint(mousePos):
-                    
-                    #IF TOO LITTLE WALLS
-                    if sum(sum(row) for row in board) < 25 and algorithm in (2,3):
-                        rect = pygame.Rect(600,565,100,50)
-                        msg = BTN_TEXT.render('Please put more walls!', 1, RED)
-                        screen.blit(msg, (rect.x,rect.y))
-
-                    else:
-                        #REMOVE MORE WALLS TEXT
-                        rect = pygame.Rect(600,565,100,50)
-                        msg = BTN_TEXT.render('Please put more walls!', 1, BLACK)
-                        screen.blit(msg, (rect.x,rect.y))
-
-                        #EMPTY BOARD 
-                        for i in range(len(board)):
-                            for j in range(len(board)):
-                                if not board[i][j] and (i,j) not in ((0,0),(9,9)):
-                                    box = pygame.Rect((j+1)*50, (i+1)*50, 50, 50)
-                                    pygame.draw.rect(screen, BLACK, box)
-                                    pygame.draw.rect(screen, ORANGE, box, 3)
-                                    
-                        if algorithm != 0:
-
-                            #REMOVE PICK AN ALGORITHM TEXT
-                            rect = pygame.Rect(600,50,100,50)
-                            msg = BTN_TEXT.render('Please pick an algorithm', 1, BLACK)
-                            screen.blit(msg, (rect.x,rect.y))
-
-                            #MAKE MAZE OBJECT
-                            maze = Maze(board, algorithm)
-                            pygame.display.set_caption('Loading... DO NOT CLICK ANYTHING WHILE LOAD!')
-                            solved = maze.solve(checkbox_filled)
-
-                            #PREVENT USER FROM CLICKING WHILE ALGORITHM IS RUNNING
-                            pygame.event.set_blocked(MOUSEBUTTONDOWN)
-
-                            if solved and checkbox_filled:
-
-                                #REMOVE UNSOLVABLE TEXT
-                                rect = pygame.Rect(600,535,100,50)
-                                msg = BTN_TEXT.render('Unsolvable!', 1, BLACK)
-                                screen.blit(msg, (rect.x,rect.y))
-
-                                #SHOW ALGORITHM PATHFINDING
-                                pygame.display.set_caption('Algorithmic Maze Runner')
-                                steps, solution = solved
-                                for step in steps:
-                                    if step not in ((0,0),(9,9)):
-                                        time.sleep(0.1)
-                                        i,j  = step
-                                        box = pygame.Rect((j+1)*50, (i+1)*50, 50, 50)
-                                        pygame.draw.rect(screen, YELLOW, box)
-                                        pygame.draw.rect(screen, ORANGE, box, 3)
-                                        pygame.display.update()
-
-                            if solved:
-                                solution = solution if checkbox_filled else solved
-                                #SHOW FINAL SOLUTION
-                                for move in solution:
-                                    if move not in ((0,0),(9,9)):
-                                        time.sleep(0.1)
-                                        i,j = move
-                                        box = pygame.Rect((j+1)*50, (i+1)*50, 50, 50)
-                                        pygame.draw.rect(screen, GREEN, box)
-                                        pygame.draw.rect(screen, ORANGE, box, 3)
-                                        pygame.display.update()
-                            
-                            #IF UNSOLVABLE
-                            else:
-                                rect = pygame.Rect(600,535,100,50)
-                                msg = BTN_TEXT.render('Unsolvable!', 1, RED)
-                                screen.blit(msg, (rect.x,rect.y))
-
-                            pygame.event.set_allowed(MOUSEBUTTONDOWN)
-
-                        #IF ALGORITHM NOT YET PICKED
-                        else:
-                            rect = pygame.Rect(600,50,100,50)
-                            msg = BTN_TEXT.render('Please pick an algorithm', 1, RED)
-                            screen.blit(msg, (rect.x,rect.y))
-
-                #RESET BUTTON
-                if reset_button.collidepoint(mousePos):
-                    board_drawn = False
-                    board = []
-                    coordinates = []
-                    screen.fill(BLACK)
-
-                #CLICK ON SQUARE(S)   
-                else:
-                    for x,y in coordinates:
-                        if (x,y) not in ((50,50),(500,500)):
-                            box = pygame.Rect(x,y,50,50)
-                            if box.collidepoint(mousePos):
-                                if event.button == 1:
-                                    pygame.draw.rect(screen, PURPLE, box)
-                                    pygame.draw.rect(screen, ORANGE, box,3)
-                                    board[int(y/50-1)][int(x/50-1)] = True
-                                elif event.button == 3:
-                                    pygame.draw.rect(screen, BLACK, box)
-                                    pygame.draw.rect(screen, ORANGE, box,3)
-                                    board[int(y/50-1)][int(x/50-1)] = False                        
-                                break
-            
-            #IF MOUSE IS LIFTED UP
-            if event.type == pygame.MOUSEBUTTONUP:
-                cursor_drag = False
-            
-            #IF MOUSE IS DRAGGED AROUND
-            if event.type == pygame.MOUSEMOTION:
-                if cursor_drag:
-                    mousePos_x, mousePos_y = pygame.mouse.get_pos()
-                    x, y = round(mousePos_x / 50) * 50, round(mousePos_y / 50) * 50
-                    if (x, y) in coordinates and (x,y) not in ((50,50),(500,500)):
-                        box = pygame.Rect(x, y, 50,50)    
-                        if box.collidepoint(x, y):
-                            if button == 1:
-                                pygame.draw.rect(screen, PURPLE, box)
-                                pygame.draw.rect(screen, ORANGE, box,3)
-                                board[int(y/50-1)][int(x/50-1)] = True
-                                pygame.display.update()
-                                break
-                            elif button == 3:
-                                pygame.draw.rect(screen, BLACK, box)
-                                pygame.draw.rect(screen, ORANGE, box,3)
-                                board[int(y/50-1)][int(x/50-1)] = False
-                                pygame.display.update()
-                                break   
-        pygame.display.update()
+                #EMPTY BOARD 
+                clear_marks()
+                live_path = None
                             
+                if algorithm != 0:
 
-            
-            
-            
+                    #REMOVE PICK AN ALGORITHM TEXT
+                    show_message('Please pick an algorithm', (600,50), False)
+
+                    #SOLVE THE MAZE (OR REUSE THE LAST SOLUTION FOR THIS BOARD) IN THE BACKGROUND
+                    pygame.display.set_caption('Solving... (Esc to cancel)')
+                    solved_algorithm = algorithm
+                    solve_job = SolveJob(solutions.solve, [row[:] for row in board], algorithm, START, GOAL, show_steps = checkbox_filled)
 
+                #IF ALGORITHM NOT YET PICKED
+                else:
+                    show_message('Please pick an algorithm', (600,50), True)
+
+            #RESET BUTTON
+            if reset_button.collidepoint(mousePos):
+                planner = None
+                live_path = None
+                painted.clear()
+                stop_solving()
+                draw_game()
+
+            #SAVE AND LOAD BUTTONS
+            elif save_button.collidepoint(mousePos):
+                save_board()
+            elif load_button.collidepoint(mousePos):
+                load_board()
+            elif generate_button.collidepoint(mousePos):
+                generate_board()
+
+            #CLICK ON SQUARE(S)   
+            else:
+                cell = cell_at(mousePos)
+                if cell and cell not in (START, GOAL) and event.button in (1,3) and not busy():
+                    paint_cell(*cell, event.button == 1)
+        
+        #IF MOUSE IS LIFTED UP
+        if event.type == pygame.MOUSEBUTTONUP:
+            cursor_drag = False
+        
+        #IF MOUSE IS DRAGGED AROUND
+        if event.type == pygame.MOUSEMOTION:
+            if cursor_drag:
+                cell = cell_at(pygame.mouse.get_pos())
+                if cell and cell not in (START, GOAL) and button in (1,3) and not busy():
+                    paint_cell(*cell, button == 1)
+
+        #ANIMATION CONTROLS
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE and busy():
+                stop_solving()
+            elif event.key == pygame.K_SPACE and animation is not None:
+                animation.finish()
+            elif event.key == pygame.K_UP:
+                animation_speed *= 2
+            elif event.key == pygame.K_DOWN:
+                animation_speed = max(1, animation_speed // 2)
+            if animation is not None:
+                animation.speed = animation_speed
+
+    if not homepage:
+        for widget in (algo_list, checkbox):
+            rect = widget.draw(screen)
+            if rect:
+                dirty.append(rect)
+
+    #BACKGROUND SOLVE FINISHED: SHOW THE RESULT AND START ANIMATING IT
+    if solve_job is not None and solve_job.done and solve_job.error is not None:
+        error = solve_job.error
+        stop_solving()
+        pygame.display.set_caption(f'Solve failed: {error!r}')
+
+    elif solve_job is not None and solve_job.done:
+        solved = solve_job.result
+        show_steps = solve_job.show_steps
+        solve_job = None
+
+        if show_steps and solved:
+            steps, solution = solved
+        else:
+            steps, solution = [], solved
+
+        show_message('Unsolvable!', (600,535), not solved)
+        cells = [(step, YELLOW) for step in steps if step not in (START, GOAL)]
+        cells += [(move, GREEN) for move in solution or () if move not in (START, GOAL)]
+        animation = Animation(cells, animation_speed, mark_cell)
+        pygame.display.set_caption('Space: skip to the end, Esc: cancel, Up/Down: speed')
+
+        #KEEP A SHORTEST-PATH SOLUTION LIVE WHILE WALLS ARE EDITED
+        if solved_algorithm in SHORTEST_PATHS:
+            live_path = set(solution or ()) - {START, GOAL}
+
+    #NEXT ANIMATION FRAME (TIME SPENT WAITING FOR EVENTS WHILE IDLE DOES NOT COUNT)
+    dt = min(clock.tick(FPS) / 1000, 0.1)
+    if animation is not None:
+        animation.advance(dt)
+        if animation.done():
+            stop_solving()
+
+    #PUSH ONLY THE CHANGED AREAS TO THE DISPLAY (THE WHOLE WINDOW IF THERE ARE MANY)
+    if dirty:
+        pygame.display.update(dirty if len(dirty) < 500 else screen.get_rect())
+        dirty.clear()
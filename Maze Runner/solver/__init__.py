@@ -0,0 +1,13 @@
+#ALGORITHMIC MAZE RUNNER - SOLVER CORE
+#Importable without pygame so mazes can be solved headless (see cli.py)
+
+from .grid import Grid
+from .node import Node
+from .frontiers import StackFrontier, QueueFrontier, ManhattanFrontier
+from .maze import ALGORITHMS, Maze
+from .stats import SolveStats
+from .batch import solve_many
+from .cache import SolutionCache
+from .incremental import IncrementalPlanner
+from .queries import QuerySolver
+from .hierarchical import HierarchicalPlanner
@@ -0,0 +1,77 @@
+#BATCH SOLVING ACROSS A PROCESS POOL
+#
+#    for index, moves in solve_many([(board, 'astar'), (grid, 2, (0,0), (5,7))]):
+#        ...
+#
+#A job is (board, algorithm) or (board, algorithm, start, goal), where board is
+#a Grid or a list of lists of bools and algorithm an id or ALGORITHMS name.
+#Boards travel to the workers bit-packed and jobs are sent in chunks. Results
+#are (job index, moves) pairs, moves being what Maze.solve(False) returns.
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from .grid import Grid
+from .maze import Maze, algorithm_id
+
+
+#PICKLABLE, COMPACT FORM OF A JOB
+def pack_job(job):
+    board, algorithm = job[0], job[1]
+    start, goal = job[2:4] if len(job) > 2 else (None, None)
+    grid = board if isinstance(board, Grid) else Grid.from_board(board)
+    return (grid.height, grid.width, grid.pack(), algorithm_id(algorithm), start, goal)
+
+
+def solve_packed(height, width, data, algorithm, start = None, goal = None):
+    return Maze(Grid.unpack(height, width, data), algorithm, start, goal).solve(False)
+
+
+def solve_chunk(chunk):
+    return [(index, solve_packed(*job)) for index, job in chunk]
+
+
+def chunks(jobs, chunksize):
+    numbered = ((index, pack_job(job)) for index, job in enumerate(jobs))
+    while True:
+        chunk = list(islice(numbered, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+#YIELDS (index, moves) IN SUBMISSION ORDER (ordered = True) OR AS CHUNKS FINISH.
+#jobs IS CONSUMED LAZILY WITH AT MOST TWO CHUNKS PER WORKER IN FLIGHT. PASS AN
+#executor TO REUSE AN EXISTING POOL.
+def solve_many(jobs, workers = None, chunksize = 16, ordered = True, executor = None):
+    workers = workers or os.cpu_count() or 1
+    pool = executor or ProcessPoolExecutor(workers)
+    pending = chunks(jobs, chunksize)
+    in_flight = deque()
+
+    def refill():
+        while len(in_flight) < 2 * workers:
+            chunk = next(pending, None)
+            if chunk is None:
+                return
+            in_flight.append(pool.submit(solve_chunk, chunk))
+
+    try:
+        refill()
+        while in_flight:
+            if ordered:
+                finished = [in_flight.popleft()]
+            else:
+                finished, _ = wait(in_flight, return_when = FIRST_COMPLETED)
+                for future in finished:
+                    in_flight.remove(future)
+            for future in finished:
+                yield from future.result()
+            refill()
+    finally:
+        for future in in_flight:
+            future.cancel()
+        if executor is None:
+            pool.shutdown()
@@ -0,0 +1,95 @@
+#SOLUTION CACHE
+#Memoizes Maze.solve results under a fingerprint of the packed wall grid,
+#start, goal and algorithm, evicting the least recently used entry once
+#maxsize is reached. With a path, entries are loaded from and saved to disk.
+#
+#    cache = SolutionCache(maxsize = 1024, path = 'solutions.cache')
+#    moves = cache.solve(board, ALGORITHMS['astar'])
+#    cache.save()
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+from .grid import Grid
+from .maze import Maze, algorithm_id
+
+
+def fingerprint(grid, algorithm, start, goal):
+    digest = hashlib.blake2b(digest_size = 16)
+    digest.update(f'{grid.height}x{grid.width}:{algorithm}:{start}:{goal}:'.encode())
+    digest.update(grid.pack())
+    return digest.hexdigest()
+
+
+class SolutionCache():
+    def __init__(self, maxsize = 256, path = None):
+        self.maxsize = maxsize
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                self.entries.update(pickle.load(f))
+            self.evict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def evict(self):
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last = False)
+
+    #ENTRIES ARE (cells, moves): cells IS None WHEN SOLVED WITHOUT show_steps, SO SUCH
+    #AN ENTRY ONLY ANSWERS show_steps = False LOOKUPS. THEY ARE STORED AS TUPLES AND
+    #HANDED OUT AS NEW LISTS, SO A CALLER CHANGING ITS RESULT CANNOT CHANGE THE CACHE
+    def get(self, key, show_steps = False):
+        entry = self.entries.get(key)
+        if entry is None or (show_steps and entry[0] is None):
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return tuple(None if part is None else list(part) for part in entry)
+
+    def put(self, key, cells, moves):
+        self.entries[key] = tuple(None if part is None else tuple(part) for part in (cells, moves))
+        self.entries.move_to_end(key)
+        self.evict()
+
+    #SAME ARGUMENTS AND RETURN VALUE AS Maze(board, algorithm, start, goal).solve(show_steps)
+    def solve(self, board, algorithm, start = None, goal = None, show_steps = False, on_expand = None):
+        grid = board if isinstance(board, Grid) else Grid.from_board(board)
+        algorithm = algorithm_id(algorithm)
+        start = (0,0) if start is None else tuple(start)
+        goal = (grid.height-1, grid.width-1) if goal is None else tuple(goal)
+        key = fingerprint(grid, algorithm, start, goal)
+
+        entry = self.get(key, show_steps)
+        if entry is None:
+            solved = Maze(grid, algorithm, start, goal).solve(show_steps, on_expand = on_expand)
+            if show_steps:
+                entry = solved or ([], None)
+            else:
+                entry = (None, solved)
+            self.put(key, *entry)
+
+        cells, moves = entry
+        if show_steps and moves is not None:
+            return (cells, moves)
+        else:
+            return moves
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+    def save(self, path = None):
+        path = path or self.path
+        temp = path + '.tmp'
+        with open(temp, 'wb') as f:
+            pickle.dump(list(self.entries.items()), f, protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, path)
@@ -0,0 +1,132 @@
+#HEADLESS COMMAND LINE SOLVER
+#
+#Maze files are plain text, one line per row: '#' is a wall, 'A' the start,
+#'B' the goal and anything else an open cell. Without markers the start and
+#goal are the top-left and bottom-right corners. Binary .maze files (see
+#mazefile.py) are read too. Solutions are written back in the text format
+#with the path marked by '*'.
+#
+#    python -m solver maze.txt other.txt -a astar -o solutions/
+#    python -m solver mazes/*.txt -j 8 -o solutions/
+
+import argparse
+import os
+import sys
+
+from . import mazefile
+from .batch import solve_many
+from .grid import Grid
+from .maze import ALGORITHMS, Maze
+
+WALL = '#'
+PATH = '*'
+START = 'A'
+GOAL = 'B'
+
+
+#(board, start, goal) FROM A MAZE FILE; OSError OR ValueError IF IT CANNOT BE SOLVED AS IS
+def read_board(path):
+    if path.endswith('.maze'):
+        board, start, goal = mazefile.load(path)
+    else:
+        with open(path) as f:
+            board, start, goal = parse_rows([line.rstrip('\r\n') for line in f])
+
+    grid = board if isinstance(board, Grid) else Grid.from_board(board)
+    if not grid.height or not grid.width:
+        raise ValueError('empty maze')
+    for state in (start, goal):
+        if state is not None and not grid.in_bounds(state):
+            raise ValueError(f'{state} is outside the {grid.height}x{grid.width} board')
+    return board, start, goal
+
+
+#(board, start, goal) FROM THE LINES OF A TEXT MAZE
+def parse_rows(rows):
+    rows = list(rows)
+    while rows and not rows[-1]:
+        rows.pop()
+
+    start = goal = None
+    for i, row in enumerate(rows):
+        if START in row:
+            start = (i, row.index(START))
+        if GOAL in row:
+            goal = (i, row.index(GOAL))
+
+    width = max((len(row) for row in rows), default = 0)
+    board = [[col < len(row) and row[col] == WALL for col in range(width)] for row in rows]
+    return board, start, goal
+
+
+def format_solution(board, start, goal, moves):
+    if isinstance(board, Grid):
+        board = board.to_board()
+    start = start or (0,0)
+    goal = goal or (len(board)-1, len(board[0])-1)
+    path = set(moves)
+    lines = []
+    for i, row in enumerate(board):
+        line = []
+        for j, wall in enumerate(row):
+            if (i,j) == start:
+                line.append(START)
+            elif (i,j) == goal:
+                line.append(GOAL)
+            elif wall:
+                line.append(WALL)
+            else:
+                line.append(PATH if (i,j) in path else '.')
+        lines.append(''.join(line))
+    return '\n'.join(lines) + '\n'
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog = 'python -m solver', description = 'Solve maze files without the pygame window.')
+    parser.add_argument('mazes', nargs = '+', help = 'maze text (or binary .maze) files to solve')
+    parser.add_argument('-a', '--algorithm', choices = list(ALGORITHMS), default = 'astar')
+    parser.add_argument('-o', '--output', help = 'directory to write <name>.solved.txt files to (default: stdout)')
+    parser.add_argument('-j', '--jobs', type = int, default = 1, help = 'solve the files across this many worker processes')
+    return parser.parse_args(argv)
+
+
+def main(argv = None):
+    args = parse_args(argv)
+    algorithm = ALGORITHMS[args.algorithm]
+    unsolved = 0
+
+    if args.output:
+        os.makedirs(args.output, exist_ok = True)
+
+    #A FILE THAT CANNOT BE READ IS REPORTED AND COUNTED, THE OTHERS ARE STILL SOLVED
+    paths, boards = [], []
+    for path in args.mazes:
+        try:
+            boards.append(read_board(path))
+        except (OSError, ValueError) as error:
+            print(f'{path}: {error}', file = sys.stderr)
+            unsolved += 1
+            continue
+        paths.append(path)
+
+    if args.jobs > 1:
+        results = (moves for _, moves in solve_many(((board, algorithm, start, goal) for board, start, goal in boards), workers = args.jobs))
+    else:
+        results = (Maze(board, algorithm, start, goal).solve(False) for board, start, goal in boards)
+
+    for path, (board, start, goal), moves in zip(paths, boards, results):
+
+        if moves is None:
+            print(f'{path}: Unsolvable!', file = sys.stderr)
+            unsolved += 1
+            continue
+
+        solution = format_solution(board, start, goal, moves)
+        if args.output:
+            name = os.path.splitext(os.path.basename(path))[0] + '.solved.txt'
+            with open(os.path.join(args.output, name), 'w') as f:
+                f.write(solution)
+        else:
+            sys.stdout.write(solution)
+
+    return 1 if unsolved else 0
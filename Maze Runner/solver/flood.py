@@ -0,0 +1,66 @@
+#VECTORIZED BFS (FLOOD FILL)
+#Expands the whole BFS wavefront at once with shifted NumPy masks instead of
+#popping one Node at a time. Each iteration costs O(height * width) array
+#work, which wins on large open grids where the number of waves is small.
+
+import numpy as np
+
+UNREACHED = -1
+
+
+#NEXT WAVE: OPEN, UNSEEN CELLS NEXT TO ANY CELL OF THE CURRENT WAVE
+def expand(wave, open_cells):
+    grown = np.zeros_like(wave)
+    grown[1:, :] |= wave[:-1, :]
+    grown[:-1, :] |= wave[1:, :]
+    grown[:, 1:] |= wave[:, :-1]
+    grown[:, :-1] |= wave[:, 1:]
+    grown &= open_cells
+    return grown
+
+
+#BFS DISTANCE FROM start TO EVERY CELL (UNREACHED FOR WALLS AND CUT-OFF CELLS)
+#STOPS EARLY ONCE goal IS REACHED; on_wave(distance, wave) SEES EVERY WAVEFRONT
+def distance_field(walls, start, goal = None, on_wave = None):
+    distances = np.full(walls.shape, UNREACHED, dtype = np.int32)
+    if walls[start]:
+        return distances
+
+    open_cells = ~walls
+    open_cells[start] = False
+    wave = np.zeros(walls.shape, dtype = bool)
+    wave[start] = True
+    distance = 0
+
+    while True:
+        distances[wave] = distance
+        if on_wave is not None:
+            on_wave(distance, wave)
+        if goal is not None and wave[goal]:
+            break
+        wave = expand(wave, open_cells)
+        if not wave.any():
+            break
+        open_cells &= ~wave
+        distance += 1
+
+    return distances
+
+
+#WALK DOWNHILL FROM goal TO start, RETURNING THE MOVES IN Maze.solve ORDER
+def backtrack(distances, start, goal):
+    if distances[goal] == UNREACHED:
+        return None
+
+    height, width = distances.shape
+    moves = []
+    x,y = goal
+    while (x,y) != start:
+        moves.append((x,y))
+        step = distances[x, y] - 1
+        for nx, ny in ((x, y+1), (x+1, y), (x, y-1), (x-1, y)):
+            if 0 <= nx < height and 0 <= ny < width and distances[nx, ny] == step:
+                x,y = nx, ny
+                break
+    moves.reverse()
+    return moves
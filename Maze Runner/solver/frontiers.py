@@ -0,0 +1,74 @@
+import heapq
+from collections import deque
+
+
+#FRONTIERS HOLD STATES DIRECTLY (FLAT CELL INDICES IN Maze); THE SEARCH TREE ITSELF
+#LIVES IN THE MAZE'S PARENT/ACTION/COST ARRAYS
+
+#DEPTH FIRST SEARCH (DFS)
+#DEQUE OF STATES PLUS A COUNT OF EACH STATE IN IT FOR O(1) MEMBERSHIP TESTS
+class StackFrontier():
+    def __init__(self):
+        self.frontier = deque()
+        self.states = {}
+        self.added = 0
+        
+    def add(self, state):
+        self.added += 1
+        self.frontier.append(state)
+        self.states[state] = self.states.get(state, 0) + 1
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def pop(self):
+        return self.frontier.pop()
+
+    def remove(self):
+        if self.empty():
+            raise Exception('Frontier already empty!')
+        else:
+            state = self.pop()
+            count = self.states[state] - 1
+            if count:
+                self.states[state] = count
+            else:
+                del self.states[state]
+            return [state]
+
+#BREADTH FIRST SEARCH (BFS)
+class QueueFrontier(StackFrontier):
+    def pop(self):
+        return self.frontier.popleft()
+
+#A* SEARCH FRONTIER (MANHATTAN DISTANCE HEURISTIC FUNCTION)
+#BINARY HEAP ORDERED BY (g + h, h, insertion order)
+#WITH A width, STATES ARE FLAT CELL INDICES (x * width + y) INSTEAD OF (x,y) TUPLES
+class ManhattanFrontier():
+    def __init__(self, goal, width = None):
+        self.goal = goal
+        self.width = width
+        self.frontier = []
+        self.counter = 0
+
+    def heuristic(self, state):
+        x,y = divmod(state, self.width) if self.width else state
+        gx,gy = self.goal
+        return abs(x-gx) + abs(y-gy)
+
+    def add(self, state, cost):
+        h = self.heuristic(state)
+        self.counter += 1
+        heapq.heappush(self.frontier, (cost + h, h, self.counter, state))
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def remove(self):
+        if self.empty():
+            raise Exception('Frontier already empty!')
+        else:
+            return [heapq.heappop(self.frontier)[-1]]
@@ -0,0 +1,194 @@
+#MAZE GENERATORS
+#Reproducible boards for benchmarks and demos. Each generator returns a Grid
+#and takes a seed, so the same arguments always give the same board. Apart
+#from random_walls, every board has a path between the default start and
+#goal (the top-left and bottom-right corners).
+#
+#The perfect-maze generators (backtracker, kruskal, prim) put rooms on even
+#(x,y) and knock out the walls between them, so every two open cells are
+#joined by exactly one path. kruskal and density_fill are vectorized with
+#NumPy and are the ones to use for very large boards.
+#
+#    grid = backtracker(101, 101, seed = 1)
+#    grid = GENERATORS['kruskal'](4001, 4001, seed = 1)
+
+import random
+
+import numpy as np
+
+from .grid import Grid
+
+
+#NO WALLS AT ALL
+def open_field(height, width, seed = None):
+    return Grid(height, width)
+
+
+#EVERY CELL IS A WALL WITH PROBABILITY density
+def random_walls(height, width, density = 0.2, seed = None):
+    rng = np.random.default_rng(seed)
+    walls = rng.random(height * width) < density
+    return Grid(height, width, bytearray(walls.astype(np.uint8).tobytes()))
+
+
+#random_walls WITH A RANDOM STAIRCASE (x AND y ONLY EVER GROW) FROM CORNER TO CORNER
+#CARVED OUT, SO IT IS ALWAYS SOLVABLE
+def density_fill(height, width, density = 0.3, seed = None):
+    rng = np.random.default_rng(seed)
+    walls = (rng.random((height, width)) < density).astype(np.uint8)
+    if walls.size:
+        steps = np.zeros(height + width - 2, dtype = np.int64)
+        steps[:height-1] = 1
+        rng.shuffle(steps)
+        rows = np.concatenate(([0], np.cumsum(steps)))
+        cols = np.arange(height + width - 1) - rows
+        walls[rows, cols] = 0
+    return Grid(height, width, bytearray(walls.tobytes()))
+
+
+#ON EVEN-SIZED BOARDS THE BOTTOM-RIGHT CORNER IS NOT A ROOM; JOIN IT TO THE NEAREST ONE
+def open_corner(cells, height, width):
+    rx, ry = (height-1) - (height-1) % 2, (width-1) - (width-1) % 2
+    for x in range(rx, height):
+        cells[x*width + width-1] = 0
+    for y in range(ry, width):
+        cells[rx*width + y] = 0
+
+
+#PERFECT MAZE CARVED BY A RANDOMIZED DEPTH-FIRST WALK (RECURSIVE BACKTRACKER, WITH AN
+#EXPLICIT STACK): LONG, WINDING CORRIDORS AND FEW DEAD ENDS
+def backtracker(height, width, seed = None):
+    rng = random.Random(seed)
+    cells = bytearray(b'\x01') * (height * width)
+    if not cells:
+        return Grid(height, width, cells)
+
+    #FLAT CELL INDICES; UNVISITED NEIGHBOR ROOMS ARE LISTED x+2, y+2, x-2, y-2
+    cells[0] = 0
+    stack = [0]
+    while stack:
+        i = stack[-1]
+        x,y = divmod(i, width)
+        rooms = []
+        if x + 2 < height and cells[i + 2*width]:
+            rooms.append(i + 2*width)
+        if y + 2 < width and cells[i + 2]:
+            rooms.append(i + 2)
+        if x >= 2 and cells[i - 2*width]:
+            rooms.append(i - 2*width)
+        if y >= 2 and cells[i - 2]:
+            rooms.append(i - 2)
+        if not rooms:
+            stack.pop()
+            continue
+        room = rng.choice(rooms)
+        cells[(i + room) // 2] = 0
+        cells[room] = 0
+        stack.append(room)
+
+    open_corner(cells, height, width)
+    return Grid(height, width, cells)
+
+
+#PERFECT MAZE FROM RANDOMIZED KRUSKAL: THE MINIMUM SPANNING TREE OF THE ROOMS WITH
+#RANDOM WALL WEIGHTS. INSTEAD OF ONE UNION-FIND STEP PER WALL, THE TREE IS BUILT
+#BORUVKA-STYLE (SAME TREE, AS THE WEIGHTS ARE DISTINCT) IN A FEW ARRAY PASSES:
+#EVERY COMPONENT OPENS ITS LIGHTEST WALL TO ANOTHER COMPONENT, THE JOINED
+#COMPONENTS ARE RELABELLED AND WALLS INSIDE ONE COMPONENT DROPPED, UNTIL NONE ARE LEFT
+def kruskal(height, width, seed = None):
+    rng = np.random.default_rng(seed)
+    rows, cols = (height + 1) // 2, (width + 1) // 2
+    cells = np.ones((height, width), dtype = np.uint8)
+    cells[::2, ::2] = 0
+    flat = cells.reshape(-1)
+
+    #WALL k SEPARATES ROOMS a[k] AND b[k]; ITS WEIGHT IS RANDOM IN THE HIGH BITS AND
+    #ITS CELL INDEX IN THE LOW ONES, WHICH MAKES EVERY WEIGHT DISTINCT
+    room = np.arange(rows * cols, dtype = np.int32).reshape(rows, cols)
+    cell = np.arange(height * width, dtype = np.int64).reshape(height, width)
+    a = np.concatenate((room[:, :-1].ravel(), room[:-1, :].ravel()))
+    b = np.concatenate((room[:, 1:].ravel(), room[1:, :].ravel()))
+    bits = (height * width).bit_length()
+    weight = rng.integers(0, 2**(62 - bits), len(a), dtype = np.int64) << bits
+    weight |= np.concatenate((cell[::2, 1::2][:, :cols-1].ravel(), cell[1::2, ::2][:rows-1, :].ravel()))
+
+    count = rows * cols
+    while len(a):
+        lightest = np.full(count, np.iinfo(np.int64).max)
+        np.minimum.at(lightest, a, weight)
+        np.minimum.at(lightest, b, weight)
+        from_a = weight == lightest[a]
+        from_b = weight == lightest[b]
+        flat[weight[from_a | from_b] & ((1 << bits) - 1)] = 0
+
+        #EACH COMPONENT POINTS ACROSS ITS LIGHTEST WALL; TWO THAT PICKED THE SAME WALL
+        #POINT AT EACH OTHER, AND THE LOWER ONE BECOMES THE ROOT OF THE MERGED COMPONENT
+        parent = np.arange(count, dtype = np.int32)
+        parent[a[from_a]] = b[from_a]
+        parent[b[from_b]] = a[from_b]
+        mutual = from_a & from_b
+        low = np.minimum(a[mutual], b[mutual])
+        parent[low] = low
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+        label = np.cumsum(parent == np.arange(count), dtype = np.int32) - 1
+        parent = label[parent]
+        count = int(label[-1]) + 1
+        a, b = parent[a], parent[b]
+        between = a != b
+        a, b, weight = a[between], b[between], weight[between]
+
+    cells = bytearray(cells.tobytes())
+    if cells:
+        open_corner(cells, height, width)
+    return Grid(height, width, cells)
+
+
+#PERFECT MAZE FROM RANDOMIZED PRIM: GROWS ONE TREE FROM THE TOP-LEFT ROOM, EACH STEP
+#OPENING A RANDOM WALL ON ITS EDGE THAT LEADS TO A NEW ROOM: MANY SHORT DEAD ENDS
+def prim(height, width, seed = None):
+    rng = random.Random(seed)
+    cells = bytearray(b'\x01') * (height * width)
+    if not cells:
+        return Grid(height, width, cells)
+
+    #(WALL, ROOM BEHIND IT) PAIRS ON THE EDGE OF THE TREE, REMOVED BY SWAPPING WITH THE LAST
+    edge = []
+    def add(x, y):
+        i = x*width + y
+        cells[i] = 0
+        if x + 2 < height and cells[i + 2*width]:
+            edge.append((i + width, i + 2*width))
+        if y + 2 < width and cells[i + 2]:
+            edge.append((i + 1, i + 2))
+        if x >= 2 and cells[i - 2*width]:
+            edge.append((i - width, i - 2*width))
+        if y >= 2 and cells[i - 2]:
+            edge.append((i - 1, i - 2))
+
+    add(0, 0)
+    while edge:
+        k = int(rng.random() * len(edge))
+        edge[k], edge[-1] = edge[-1], edge[k]
+        wall, room = edge.pop()
+        if cells[room]:
+            cells[wall] = 0
+            add(*divmod(room, width))
+
+    open_corner(cells, height, width)
+    return Grid(height, width, cells)
+
+
+#NAME -> GENERATOR, ALL CALLED AS generator(height, width, ..., seed = seed)
+GENERATORS = {
+    'open': open_field,
+    'random': random_walls,
+    'density': density_fill,
+    'backtracker': backtracker,
+    'kruskal': kruskal,
+    'prim': prim,
+}
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+#NEIGHBOR BITS IN A CELL'S MASK, IN THE ORIGINAL ACTION ORDER
+DOWN, RIGHT, UP, LEFT = 1, 2, 4, 8
+
+#COMPACT WALL GRID
+#Row-major bytearray with one byte per cell (1 = wall), so a state (x,y)
+#lives at index x * width + y. Boards of any size and shape are supported.
+class Grid():
+    def __init__(self, height, width, cells = None):
+        self.height = height
+        self.width = width
+        self.cells = bytearray(height * width) if cells is None else cells
+        if len(self.cells) != height * width:
+            raise ValueError(f'Expected {height * width} cells, got {len(self.cells)}')
+
+    #BUILD FROM THE UI'S LIST OF LISTS OF BOOLS
+    @classmethod
+    def from_board(cls, board):
+        height = len(board)
+        width = len(board[0]) if height else 0
+        cells = bytearray(height * width)
+        for i, row in enumerate(board):
+            if len(row) != width:
+                raise ValueError('All board rows must have the same length')
+            cells[i*width:(i+1)*width] = bytes(map(bool, row))
+        return cls(height, width, cells)
+
+    #BIT-PACKED FORM (8 CELLS PER BYTE) FOR SENDING BOARDS BETWEEN PROCESSES
+    @classmethod
+    def unpack(cls, height, width, data):
+        bits = np.unpackbits(np.frombuffer(data, dtype = np.uint8), count = height * width)
+        return cls(height, width, bytearray(bits.tobytes()))
+
+    def pack(self):
+        return np.packbits(np.frombuffer(self.cells, dtype = np.uint8)).tobytes()
+
+    def to_board(self):
+        w = self.width
+        return [[bool(cell) for cell in self.cells[i*w:(i+1)*w]] for i in range(self.height)]
+
+    def copy(self):
+        return Grid(self.height, self.width, bytearray(self.cells))
+
+    def index(self, state):
+        x,y = state
+        return x * self.width + y
+
+    def state(self, index):
+        return divmod(index, self.width)
+
+    def in_bounds(self, state):
+        x,y = state
+        return 0 <= x < self.height and 0 <= y < self.width
+
+    def is_wall(self, state):
+        return bool(self.cells[self.index(state)])
+
+    def set_wall(self, state, wall = True):
+        self.cells[self.index(state)] = 1 if wall else 0
+
+    def wall_count(self):
+        return self.cells.count(1)
+
+    #2D BOOL VIEW OF THE WALLS FOR NUMPY SOLVERS
+    def to_array(self):
+        return np.frombuffer(self.cells, dtype = np.uint8).reshape(self.height, self.width).astype(bool)
+
+    #ONE BYTE PER CELL WITH A DOWN/RIGHT/UP/LEFT BIT FOR EVERY OPEN, IN-BOUNDS NEIGHBOR
+    #(0 FOR WALLS), BUILT IN ONE VECTORIZED PASS
+    def neighbor_masks(self):
+        open_cells = ~self.to_array()
+        masks = np.zeros((self.height, self.width), dtype = np.uint8)
+        masks[:, :-1] |= (open_cells[:, :-1] & open_cells[:, 1:]) * np.uint8(DOWN)
+        masks[:-1, :] |= (open_cells[:-1, :] & open_cells[1:, :]) * np.uint8(RIGHT)
+        masks[:, 1:] |= (open_cells[:, 1:] & open_cells[:, :-1]) * np.uint8(UP)
+        masks[1:, :] |= (open_cells[1:, :] & open_cells[:-1, :]) * np.uint8(LEFT)
+        return bytearray(masks.tobytes())
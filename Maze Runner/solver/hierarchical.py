@@ -0,0 +1,294 @@
+#HIERARCHICAL PATH-FINDING (HPA*)
+#Splits the board into cluster x cluster blocks. Along every border between
+#two clusters, each run of cells open on both sides becomes an entrance: one
+#pair of transition cells in the middle of a short run, one at each end of a
+#long one. The abstract graph has those transition cells as nodes, a cost-1
+#edge across each entrance and an edge between every two transitions of a
+#cluster that can reach each other inside it, weighted by that distance.
+#
+#A query links its start and goal to the transitions of their clusters, runs
+#A* over the abstract graph and refines each abstract edge into cells with a
+#BFS confined to one cluster, so no query ever searches more than a cluster
+#of cells at a time. Paths are valid but not always shortest: they pass
+#through transition cells, and each cluster is crossed by the shortest
+#route inside it (benchmarks/hierarchical.py measures the gap to exact A*).
+#
+#Editing a wall only marks its cluster stale, plus the neighbor across a
+#border it lies on; stale clusters are rebuilt at the next solve().
+#
+#    planner = HierarchicalPlanner(board, cluster = 16)
+#    moves = planner.solve(start, goal)
+#    planner.set_wall((3,4))
+
+from collections import deque
+
+import numpy as np
+
+from .frontiers import ManhattanFrontier
+from .grid import Grid, DOWN, RIGHT, UP, LEFT
+
+#RUNS AT LEAST THIS LONG GET A TRANSITION AT EACH END INSTEAD OF ONE IN THE MIDDLE
+WIDE_ENTRANCE = 6
+
+
+class HierarchicalPlanner():
+    def __init__(self, board, cluster = 16):
+        if cluster < 1:
+            raise ValueError('cluster must be at least 1')
+        grid = board if isinstance(board, Grid) else Grid.from_board(board)
+        self.grid = grid.copy()
+        self.height = grid.height
+        self.width = grid.width
+        self.size = cluster
+        self.rows = -(-self.height // cluster)
+        self.cols = -(-self.width // cluster)
+        self.steps = [tuple(offset for bit, offset in ((DOWN, 1), (RIGHT, self.width), (UP, -1), (LEFT, -self.width)) if mask & bit)
+                      for mask in range(16)]
+        self.masks = self.cluster_masks()
+
+        #borders[(c, d)]: (cell in c, cell in d) TRANSITION PAIRS, c < d
+        #links[cell]: TRANSITION CELLS ACROSS AN ENTRANCE FROM cell
+        #edges[c][cell]: {transition: distance} INSIDE CLUSTER c
+        self.borders = {}
+        self.links = {}
+        self.edges = [None] * (self.rows * self.cols)
+        for c in range(self.rows * self.cols):
+            cx, cy = divmod(c, self.cols)
+            if cy + 1 < self.cols:
+                self.connect(c, c + 1)
+            if cx + 1 < self.rows:
+                self.connect(c, c + self.cols)
+        for c in range(self.rows * self.cols):
+            self.edges[c] = self.cluster_edges(c)
+
+        self.stale = set()
+        self.stale_borders = set()
+        self.rebuilt = 0
+        self.expanded = 0
+
+    #NEIGHBOR MASKS (SEE Grid.neighbor_masks) WITH THE BITS THAT CROSS A CLUSTER BORDER
+    #CLEARED, SO A BFS OVER THEM NEVER LEAVES ITS CLUSTER
+    def cluster_masks(self):
+        masks = np.frombuffer(self.grid.neighbor_masks(), dtype = np.uint8).reshape(self.height, self.width).copy()
+        rows = np.arange(self.height) % self.size
+        cols = np.arange(self.width) % self.size
+        masks[:, cols == self.size - 1] &= np.uint8(~DOWN & 15)
+        masks[rows == self.size - 1, :] &= np.uint8(~RIGHT & 15)
+        masks[:, cols == 0] &= np.uint8(~UP & 15)
+        masks[rows == 0, :] &= np.uint8(~LEFT & 15)
+        return bytearray(masks.tobytes())
+
+    def cell_mask(self, i):
+        cells, size, width = self.grid.cells, self.size, self.width
+        if cells[i]:
+            return 0
+        x,y = divmod(i, width)
+        mask = 0
+        if (y + 1) % size and y + 1 < width and not cells[i+1]:
+            mask |= DOWN
+        if (x + 1) % size and x + 1 < self.height and not cells[i+width]:
+            mask |= RIGHT
+        if y % size and not cells[i-1]:
+            mask |= UP
+        if x % size and not cells[i-width]:
+            mask |= LEFT
+        return mask
+
+    def cluster(self, i):
+        x,y = divmod(i, self.width)
+        return x // self.size * self.cols + y // self.size
+
+    def index(self, state):
+        x,y = state
+        if not (0 <= x < self.height and 0 <= y < self.width):
+            raise ValueError(f'{state} is outside the {self.height}x{self.width} board')
+        return x * self.width + y
+
+    #(RE)BUILD THE ENTRANCES ON THE BORDER BETWEEN CLUSTERS c AND d (d RIGHT OF OR BELOW c)
+    def connect(self, c, d):
+        for a, b in self.borders.get((c, d), ()):
+            self.links[a].remove(b)
+            self.links[b].remove(a)
+
+        cx, cy = divmod(c, self.cols)
+        width, size = self.width, self.size
+        if d == c + 1 and cy + 1 < self.cols:
+            edge = (cy + 1) * size - 1
+            pairs = [(x * width + edge, x * width + edge + 1) for x in range(cx * size, min((cx + 1) * size, self.height))]
+        else:
+            edge = (cx + 1) * size - 1
+            pairs = [(edge * width + y, (edge + 1) * width + y) for y in range(cy * size, min((cy + 1) * size, width))]
+
+        cells = self.grid.cells
+        transitions = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and not cells[pair[0]] and not cells[pair[1]]:
+                run.append(pair)
+                continue
+            if len(run) >= WIDE_ENTRANCE:
+                transitions += [run[0], run[-1]]
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+
+        self.borders[(c, d)] = transitions
+        for a, b in transitions:
+            self.links.setdefault(a, []).append(b)
+            self.links.setdefault(b, []).append(a)
+
+    def transitions(self, c):
+        cells = set()
+        for d, side in ((c - 1, 1), (c + 1, 0), (c - self.cols, 1), (c + self.cols, 0)):
+            for pair in self.borders.get((min(c, d), max(c, d)), ()):
+                cells.add(pair[side])
+        return cells
+
+    #BFS FROM i INSIDE ITS CLUSTER: DISTANCE TO EACH OF targets IT REACHES
+    def distances(self, i, targets):
+        masks, steps = self.masks, self.steps
+        found = {}
+        left = len(targets) - (i in targets)
+        depth = {i: 0}
+        queue = deque([i])
+        while queue and left:
+            cell = queue.popleft()
+            d = depth[cell] + 1
+            for offset in steps[masks[cell]]:
+                child = cell + offset
+                if child not in depth:
+                    depth[child] = d
+                    queue.append(child)
+                    if child in targets:
+                        found[child] = d
+                        left -= 1
+        return found
+
+    #DISTANCES ARE SYMMETRIC, SO EACH BFS ONLY LOOKS FOR THE TRANSITIONS NOT MEASURED YET
+    def cluster_edges(self, c):
+        transitions = self.transitions(c)
+        edges = {i: {} for i in transitions}
+        waiting = set(transitions)
+        for i in transitions:
+            waiting.discard(i)
+            for j, d in self.distances(i, waiting).items():
+                edges[i][j] = edges[j][i] = d
+        return edges
+
+    def set_wall(self, state, wall = True):
+        i = self.index(state)
+        if bool(self.grid.cells[i]) == wall:
+            return
+        self.grid.cells[i] = 1 if wall else 0
+        for n in (i, i + 1, i - 1, i + self.width, i - self.width):
+            if 0 <= n < len(self.masks):
+                self.masks[n] = self.cell_mask(n)
+
+        c = self.cluster(i)
+        x,y = state
+        self.stale.add(c)
+        if y % self.size == self.size - 1 and y + 1 < self.width:
+            self.stale_borders.add((c, c + 1))
+        if y % self.size == 0 and y > 0:
+            self.stale_borders.add((c - 1, c))
+        if x % self.size == self.size - 1 and x + 1 < self.height:
+            self.stale_borders.add((c, c + self.cols))
+        if x % self.size == 0 and x > 0:
+            self.stale_borders.add((c - self.cols, c))
+
+    def toggle(self, state):
+        self.set_wall(state, not self.grid.is_wall(state))
+
+    #REBUILD WHAT set_wall MARKED STALE; A CHANGED BORDER ALSO STALES THE CLUSTER ACROSS IT
+    def refresh(self):
+        for c, d in self.stale_borders:
+            self.connect(c, d)
+            self.stale.update((c, d))
+        for c in self.stale:
+            self.edges[c] = self.cluster_edges(c)
+        self.rebuilt += len(self.stale)
+        self.stale_borders.clear()
+        self.stale.clear()
+
+    #MOVES LIKE Maze.solve(False), OR None IF THE GOAL IS UNREACHABLE OR EITHER END IS A WALL
+    def solve(self, start, goal):
+        s, g = self.index(start), self.index(goal)
+        if self.grid.cells[s] or self.grid.cells[g]:
+            return None
+        if s == g:
+            return []
+        if self.stale or self.stale_borders:
+            self.refresh()
+
+        #LINK THE START AND GOAL TO THEIR CLUSTERS' TRANSITIONS (AND EACH OTHER IF CLOSE)
+        first, last = self.cluster(s), self.cluster(g)
+        extra = {s: self.distances(s, self.transitions(first) | ({g} if first == last else set()))}
+        for i, d in self.distances(g, self.transitions(last)).items():
+            extra.setdefault(i, {})[g] = d
+
+        route = self.abstract_search(s, g, extra)
+        if route is None:
+            return None
+
+        moves = []
+        for u, v in zip(route, route[1:]):
+            if self.cluster(u) == self.cluster(v):
+                moves += self.local_path(u, v)
+            else:
+                moves.append(divmod(v, self.width))
+        return moves
+
+    #A* OVER TRANSITION CELLS; extra HOLDS THE QUERY'S OWN EDGES
+    def abstract_search(self, s, g, extra):
+        edges, links = self.edges, self.links
+        costs = {s: 0}
+        parents = {s: s}
+        closed = set()
+        frontier = ManhattanFrontier(divmod(g, self.width), self.width)
+        frontier.add(s, 0)
+
+        while not frontier.empty():
+            node, = frontier.remove()
+            if node in closed:
+                continue
+            if node == g:
+                route = [g]
+                while node != s:
+                    node = parents[node]
+                    route.append(node)
+                route.reverse()
+                return route
+            closed.add(node)
+            self.expanded += 1
+
+            cost = costs[node]
+            neighbors = list(edges[self.cluster(node)].get(node, {}).items())
+            neighbors += [(n, 1) for n in links.get(node, ())]
+            neighbors += extra.get(node, {}).items()
+            for n, step in neighbors:
+                if n not in closed and cost + step < costs.get(n, cost + step + 1):
+                    costs[n] = cost + step
+                    parents[n] = node
+                    frontier.add(n, cost + step)
+
+        return None
+
+    #SHORTEST CELLS FROM u (EXCLUDED) TO v (INCLUDED) INSIDE THEIR CLUSTER
+    def local_path(self, u, v):
+        masks, steps = self.masks, self.steps
+        parents = {u: u}
+        queue = deque([u])
+        while v not in parents:
+            cell = queue.popleft()
+            for offset in steps[masks[cell]]:
+                child = cell + offset
+                if child not in parents:
+                    parents[child] = cell
+                    queue.append(child)
+
+        cells = []
+        while v != u:
+            cells.append(divmod(v, self.width))
+            v = parents[v]
+        cells.reverse()
+        return cells
@@ -0,0 +1,168 @@
+#INCREMENTAL RE-PLANNING (LIFELONG PLANNING A*, LPA*)
+#Keeps g-values and one-step lookahead (rhs) values for every cell between
+#calls. Toggling a wall only marks that cell and its neighbors inconsistent,
+#and the next solve() repairs just the part of the search tree that changed
+#instead of searching the whole board again.
+#
+#    planner = IncrementalPlanner(board, start, goal)
+#    moves = planner.solve()
+#    planner.set_wall((3,4))
+#    moves = planner.solve()
+
+import heapq
+from array import array
+
+from .grid import Grid
+
+INFINITY = 2**31 - 1
+
+
+class IncrementalPlanner():
+    def __init__(self, board, start = None, goal = None):
+        grid = board if isinstance(board, Grid) else Grid.from_board(board)
+        self.height = grid.height
+        self.width = grid.width
+        self.start = (0,0) if start is None else tuple(start)
+        self.goal = (self.height-1, self.width-1) if goal is None else tuple(goal)
+
+        for state in (self.start, self.goal):
+            if not grid.in_bounds(state):
+                raise ValueError(f'{state} is outside the {self.height}x{self.width} board')
+
+        #THE START AND GOAL ARE NEVER WALLS
+        self.grid = grid.copy()
+        self.grid.set_wall(self.start, False)
+        self.grid.set_wall(self.goal, False)
+
+        size = self.height * self.width
+        self.g = array('i', [INFINITY]) * size
+        self.rhs = array('i', [INFINITY]) * size
+        self.queue = []
+        self.expanded = 0
+
+        start = self.grid.index(self.start)
+        self.rhs[start] = 0
+        self.push(start)
+
+    def heuristic(self, i):
+        x,y = divmod(i, self.width)
+        gx,gy = self.goal
+        return abs(x-gx) + abs(y-gy)
+
+    #TIES ON THE FIRST KEY GO TO THE CELL NEARER THE GOAL (AS IN ManhattanFrontier), SO
+    #AN OPEN AREA IS CROSSED STRAIGHT INSTEAD OF FILLING THE START-GOAL RECTANGLE
+    def key(self, i):
+        h = self.heuristic(i)
+        return (min(self.g[i], self.rhs[i]) + h, h)
+
+    #OPEN, IN-BOUNDS NEIGHBORS OF CELL i
+    def neighbors(self, i):
+        x,y = divmod(i, self.width)
+        cells = self.grid.cells
+        if y + 1 < self.width and not cells[i+1]:
+            yield i + 1
+        if x + 1 < self.height and not cells[i+self.width]:
+            yield i + self.width
+        if y > 0 and not cells[i-1]:
+            yield i - 1
+        if x > 0 and not cells[i-self.width]:
+            yield i - self.width
+
+    #HEAP ENTRIES ARE NEVER REMOVED IN PLACE; AN ENTRY IS STALE ONCE ITS CELL IS
+    #CONSISTENT OR ITS KEY HAS CHANGED, AND STALE ENTRIES ARE DROPPED WHEN SEEN
+    def push(self, i):
+        heapq.heappush(self.queue, (*self.key(i), i))
+
+    def top(self):
+        queue = self.queue
+        while queue:
+            k1, k2, i = queue[0]
+            if self.g[i] != self.rhs[i] and (k1, k2) == self.key(i):
+                return (k1, k2), i
+            heapq.heappop(queue)
+        return (INFINITY, INFINITY), None
+
+    def update(self, i):
+        if i != self.grid.index(self.start):
+            if self.grid.cells[i]:
+                self.rhs[i] = INFINITY
+            else:
+                self.rhs[i] = min((self.g[n] + 1 for n in self.neighbors(i) if self.g[n] != INFINITY), default = INFINITY)
+        if self.g[i] != self.rhs[i]:
+            self.push(i)
+
+    def set_wall(self, state, wall = True):
+        if state in (self.start, self.goal):
+            raise ValueError('The start and goal cannot be walls')
+        i = self.grid.index(state)
+        if bool(self.grid.cells[i]) == wall:
+            return
+        self.grid.cells[i] = 1 if wall else 0
+        self.update(i)
+        x,y = state
+        for n in (i + 1 if y + 1 < self.width else None, i + self.width if x + 1 < self.height else None,
+                  i - 1 if y > 0 else None, i - self.width if x > 0 else None):
+            if n is not None and not self.grid.cells[n]:
+                self.update(n)
+
+    def toggle(self, state):
+        self.set_wall(state, not self.grid.is_wall(state))
+
+    #REPAIR THE SEARCH TREE AND RETURN THE MOVES LIKE Maze.solve(False)
+    #on_expand: CALLED WITH EACH (x,y) AS IT IS EXPANDED
+    def solve(self, on_expand = None):
+        g, rhs = self.g, self.rhs
+        goal = self.grid.index(self.goal)
+
+        while True:
+            while True:
+                top_key, i = self.top()
+                if i is None or (top_key >= self.key(goal) and rhs[goal] == g[goal]):
+                    break
+                self.expand(i, on_expand)
+
+            #THE GOAL'S g IS NOW EXACT, BUT CELLS THAT TIE WITH IT AND ARE NEARER THE START
+            #MAY STILL BE WAITING IN THE QUEUE; KEEP EXPANDING UNTIL THE WALK BACK IS CLEAR
+            moves, waiting = self.path()
+            if waiting is None:
+                return moves
+            while g[waiting] != rhs[waiting]:
+                top_key, i = self.top()
+                if i is None:
+                    break
+                self.expand(i, on_expand)
+
+    def expand(self, i, on_expand = None):
+        g, rhs = self.g, self.rhs
+        heapq.heappop(self.queue)
+        self.expanded += 1
+        if on_expand is not None:
+            on_expand(divmod(i, self.width))
+        if g[i] > rhs[i]:
+            g[i] = rhs[i]
+            for n in self.neighbors(i):
+                self.update(n)
+        else:
+            g[i] = INFINITY
+            self.update(i)
+            for n in self.neighbors(i):
+                self.update(n)
+
+    #(moves, None) WALKING BACK FROM THE GOAL THROUGH CONSISTENT CELLS ONE STEP CLOSER TO
+    #THE START EACH TIME, OR (None, cell) FOR THE FIRST STILL INCONSISTENT CELL IT NEEDS
+    def path(self):
+        g, rhs = self.g, self.rhs
+        i = self.grid.index(self.goal)
+        start = self.grid.index(self.start)
+        if g[i] == INFINITY:
+            return None, None
+        moves = []
+        while i != start:
+            moves.append(divmod(i, self.width))
+            steps = [n for n in self.neighbors(i) if g[n] == g[i] - 1]
+            settled = [n for n in steps if g[n] == rhs[n]]
+            if not settled:
+                return None, steps[0]
+            i = settled[0]
+        moves.reverse()
+        return moves, None
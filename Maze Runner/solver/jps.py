@@ -0,0 +1,91 @@
+#JUMP POINT SEARCH FOR 4-CONNECTED GRIDS
+#Paths are made canonical by preferring vertical moves: a vertical run may turn
+#left or right at any cell, but a horizontal run only keeps going straight and
+#turns when it passes the corner of a wall (the turn is "forced" because no
+#equally short path reaches that cell without it). Runs are scanned cell by
+#cell and only the cells where they stop (the jump points) go on the A* heap,
+#so the symmetric paths through open areas are never expanded.
+#
+#Cells are flat indices (x * width + y) into walls, a bytearray with 1 = wall.
+
+
+#NEXT JUMP POINT FROM i GOING LEFT (step = -1) OR RIGHT (step = 1), OR None
+#A CELL IS A JUMP POINT IF IT IS THE GOAL OR OPENS UP/DOWN WHERE THE CELL BEFORE IT DID NOT.
+#THE ROW AND THE ROWS ABOVE AND BELOW ARE SEARCHED WITH bytearray.find/rfind, SO A
+#SCAN COSTS A FEW C CALLS INSTEAD OF A PYTHON LOOP OVER EVERY CELL OF THE RUN
+def jump_horizontal(walls, width, goal, i, step):
+    row = i - i % width
+    above, below = i >= width, i + width < len(walls)
+    sides = (-width, width) if above and below else (-width,) if above else (width,) if below else ()
+
+    if step > 0:
+        #THE RUN IS i+1 .. stop-1; best IS THE NEAREST JUMP POINT FOUND SO FAR
+        stop = walls.find(1, i + 1, row + width)
+        best = stop = row + width if stop < 0 else stop
+        if i < goal < best:
+            best = goal
+        for side in sides:
+            #FIRST WALL NEXT TO THE RUN, THEN THE FIRST OPENING AFTER IT
+            corner = walls.find(1, i + side, best - 1 + side)
+            if corner >= 0:
+                opening = walls.find(0, corner + 1, best + side)
+                if opening >= 0:
+                    best = opening - side
+    else:
+        #THE RUN IS i-1 .. stop+1
+        stop = walls.rfind(1, row, i)
+        best = stop = row - 1 if stop < 0 else stop
+        if best < goal < i:
+            best = goal
+        for side in sides:
+            corner = walls.rfind(1, best + 2 + side, i + 1 + side)
+            if corner >= 0:
+                opening = walls.rfind(0, best + 1 + side, corner)
+                if opening >= 0:
+                    best = opening - side
+
+    return None if best == stop else best
+
+
+#NEXT JUMP POINT FROM i GOING UP (step = -width) OR DOWN (step = width), OR None
+#A CELL IS A JUMP POINT IF IT IS THE GOAL OR A HORIZONTAL RUN FROM IT FINDS ONE
+def jump_vertical(walls, width, goal, i, step):
+    size = len(walls)
+    while True:
+        n = i + step
+        if n < 0 or n >= size or walls[n]:
+            return None
+        if n == goal:
+            return n
+        if jump_horizontal(walls, width, goal, n, 1) is not None or jump_horizontal(walls, width, goal, n, -1) is not None:
+            return n
+        i = n
+
+
+#JUMP POINTS REACHABLE FROM JUMP POINT i, WHICH WAS REACHED FROM parent (NO_PARENT FOR THE START)
+def successors(walls, width, goal, i, parent):
+    found = []
+    if parent < 0:
+        found.append(jump_vertical(walls, width, goal, i, width))
+        found.append(jump_vertical(walls, width, goal, i, -width))
+        found.append(jump_horizontal(walls, width, goal, i, 1))
+        found.append(jump_horizontal(walls, width, goal, i, -1))
+
+    #ARRIVED VERTICALLY: KEEP GOING AND TRY BOTH SIDES
+    elif (i - parent) % width == 0:
+        step = width if i > parent else -width
+        found.append(jump_vertical(walls, width, goal, i, step))
+        found.append(jump_horizontal(walls, width, goal, i, 1))
+        found.append(jump_horizontal(walls, width, goal, i, -1))
+
+    #ARRIVED HORIZONTALLY: KEEP GOING, AND TURN ONLY WHERE A WALL CORNER FORCES IT
+    else:
+        step = 1 if i > parent else -1
+        found.append(jump_horizontal(walls, width, goal, i, step))
+        back = i - step
+        if i >= width and walls[back-width] and not walls[i-width]:
+            found.append(jump_vertical(walls, width, goal, i, -width))
+        if i + width < len(walls) and walls[back+width] and not walls[i+width]:
+            found.append(jump_vertical(walls, width, goal, i, width))
+
+    return [n for n in found if n is not None]
@@ -0,0 +1,500 @@
+import random
+from array import array
+from itertools import permutations
+
+import numpy as np
+
+from . import flood, jps
+from .grid import Grid, DOWN, RIGHT, UP, LEFT
+from .frontiers import StackFrontier, QueueFrontier, ManhattanFrontier
+
+
+#ALGORITHM NAMES -> Maze(board, algorithm) IDS (SAME ORDER AS THE UI DROPDOWN)
+ALGORITHMS = {
+    'dfs': 1,
+    'bfs': 2,
+    'astar': 3,
+    'flood': 4,
+    'bibfs': 5,
+    'biastar': 6,
+    'jps': 7,
+}
+
+
+#ALGORITHMS NAME OR ID -> ID; ValueError FOR ANYTHING ELSE
+def algorithm_id(algorithm):
+    algorithm = ALGORITHMS.get(algorithm, algorithm)
+    if algorithm not in ALGORITHMS.values():
+        raise ValueError(f'Unknown algorithm {algorithm!r}, expected one of {", ".join(ALGORITHMS)} or their ids')
+    return algorithm
+
+#(ACTION, MASK BIT) IN THE ORIGINAL down/right/up/left ORDER
+ACTIONS = (('down', DOWN), ('right', RIGHT), ('up', UP), ('left', LEFT))
+
+#EVERY ORDERING OF THE FOUR ACTIONS; ORDERS[0] IS THE UNSHUFFLED ONE
+ORDERS = tuple(permutations(range(4)))
+
+#parents[i] OF A CELL THE SEARCH HAS NOT REACHED (AND OF THE START)
+NO_PARENT = -1
+UNREACHED_COST = 2**31 - 1
+
+#MAZE OBJECT
+#board IS A Grid OR A LIST OF LISTS OF BOOLS; start AND goal DEFAULT TO OPPOSITE CORNERS
+#NEIGHBORS ARE VISITED IN A RANDOM ORDER (PASS seed TO MAKE RUNS REPRODUCIBLE)
+#OR IN A FIXED ORDER WITH shuffle = False
+class Maze():
+    def __init__(self, board, algorithm, start = None, goal = None, seed = None, shuffle = True):
+        self.board = board
+        self.algorithm = algorithm_id(algorithm)
+
+        grid = board if isinstance(board, Grid) else Grid.from_board(board)
+        self.height = grid.height
+        self.width = grid.width
+        self.start = (0,0) if start is None else tuple(start)
+        self.goal = (self.height-1, self.width-1) if goal is None else tuple(goal)
+
+        for state in (self.start, self.goal):
+            if not grid.in_bounds(state):
+                raise ValueError(f'{state} is outside the {self.height}x{self.width} board')
+
+        #THE START AND GOAL ARE NEVER WALLS; THE MAZE ONLY COPIES THE GRID TO OPEN
+        #THEM AND OTHERWISE READS ITS CELLS IN PLACE (IT NEVER WRITES TO THEM)
+        if grid.is_wall(self.start) or grid.is_wall(self.goal):
+            grid = grid.copy()
+            grid.set_wall(self.start, False)
+            grid.set_wall(self.goal, False)
+        self.grid = grid
+        self.walls = self.grid.cells
+
+        self.random = random.Random(seed)
+        self.shuffle = shuffle
+
+        self.cells = None
+        self.stats = None
+        self.visit = None
+
+        #ADJACENCY INDEX: self.masks[i] HOLDS THE OPEN-NEIGHBOR BITS OF CELL i AND
+        #self.moves[mask][order] THE MATCHING (action number, index offset) PAIRS
+        self.masks = self.grid.neighbor_masks()
+        offsets = (1, self.width, -1, -self.width)
+        self.moves = [
+            [tuple((d, offsets[d]) for d in order if mask & ACTIONS[d][1]) for order in ORDERS]
+            for mask in range(16)
+        ]
+
+
+    #ORDERED (action number, index offset) PAIRS FOR CELL i
+    def expand(self, i):
+        return self.moves[self.masks[i]][int(self.random.random() * 24) if self.shuffle else 0]
+
+    def find_neighbors(self, state):
+        i = self.grid.index(state)
+        self.neighbors = [(ACTIONS[d][0], self.grid.state(i + offset)) for d, offset in self.expand(i)]
+        return self.neighbors
+
+    #SEARCH TREE AS FLAT ARRAYS INDEXED BY CELL: PARENT CELL AND THE ACTION THAT LED HERE
+    def reset_tree(self):
+        size = self.height * self.width
+        self.parents = array('i', [NO_PARENT]) * size
+        self.actions = bytearray(size)
+
+    #SPLICE THE BACKWARD TREE (back, ROOTED AT THE GOAL) ONTO THE FORWARD ONE THROUGH
+    #THE EDGE a -> b, THEN BACKTRACK FROM THE GOAL AS USUAL
+    def join(self, a, b, back, show_steps):
+        self.phase('path')
+        actions = {1: 0, -1: 2, self.width: 1, -self.width: 3}
+        goal = self.grid.index(self.goal)
+        prev, state = a, b
+        while True:
+            following = back[state]
+            self.parents[state] = prev
+            self.actions[state] = actions[state - prev]
+            if state == goal:
+                break
+            prev, state = state, following
+        return self.backtrack(goal, show_steps)
+
+    def backtrack(self, i, show_steps):
+        self.phase('path')
+        moves = []
+        start = self.grid.index(self.start)
+        parents = self.parents
+        while i != start:
+            moves.append(divmod(i, self.width))
+            i = parents[i]
+        moves.reverse()
+        if show_steps:
+            return (self.cells, moves)
+        else:
+            return moves
+
+    #show_steps: ALSO RETURN THE CELLS IN THE ORDER THEY WERE EXPANDED
+    #stats: A SolveStats TO FILL WITH COUNTERS AND setup/search/path TIMINGS
+    #on_expand: CALLED WITH EACH (x,y) AS IT IS EXPANDED
+    def solve(self, show_steps, stats = None, on_expand = None):
+
+        self.stats = stats
+        if stats is not None:
+            stats.enter('setup')
+        self.cells = list() if show_steps else None
+        self.visit = self.visitor(stats, on_expand)
+
+        if self.algorithm == 3:
+            result = self.astar(show_steps)
+        elif self.algorithm == 4:
+            result = self.flood(show_steps)
+        elif self.algorithm == 5:
+            result = self.bidirectional_bfs(show_steps)
+        elif self.algorithm == 6:
+            result = self.bidirectional_astar(show_steps)
+        elif self.algorithm == 7:
+            result = self.jump_point_search(show_steps)
+        else:
+            result = self.search(show_steps)
+
+        if stats is not None:
+            stats.stop()
+            self.tally(stats)
+        return result
+
+    #ONE CALLBACK PER EXPANSION FEEDING self.cells, stats AND on_expand,
+    #OR None SO THE SEARCH LOOPS SKIP IT WHEN NOTHING IS LISTENING
+    def visitor(self, stats, on_expand):
+        cells, width = self.cells, self.width
+        if cells is None and stats is None and on_expand is None:
+            return None
+
+        def visit(i, frontier_size):
+            if stats is not None:
+                stats.expand(frontier_size)
+            state = divmod(i, width)
+            if cells is not None:
+                cells.append(state)
+            if on_expand is not None:
+                on_expand(state)
+
+        return visit
+
+    def phase(self, name):
+        if self.stats is not None:
+            self.stats.enter(name)
+
+    #FRONTIER INSERTIONS AND REQUEUES, READ OFF THE SEARCH'S OWN STRUCTURES AFTER
+    #IT FINISHES SO THE LOOPS NEVER HAVE TO COUNT THEM (FLOOD FILL AND
+    #BIDIRECTIONAL BFS INSERT EVERY CELL ONCE)
+    def tally(self, stats):
+        size = self.height * self.width
+        if self.algorithm in (1, 2):
+            generated = self.frontier.added
+            inserted = size - self.parents.count(NO_PARENT) + 1
+        elif self.algorithm in (3, 7):
+            generated = self.frontier.counter
+            inserted = size - self.costs.count(UNREACHED_COST)
+        elif self.algorithm == 6:
+            generated = sum(frontier.counter for frontier in self.frontiers)
+            inserted = sum(size - costs.count(UNREACHED_COST) for costs in self.side_costs)
+        elif self.algorithm == 4:
+            generated = inserted = int(np.count_nonzero(self.distances != flood.UNREACHED))
+        else:
+            generated = inserted = self.inserted
+        stats.generated = generated
+        stats.requeued = generated - inserted
+
+    #DEPTH FIRST (1) OR BREADTH FIRST (2) SEARCH
+    def search(self, show_steps):
+
+        visit = self.visit
+
+        self.reset_tree()
+        parents, actions = self.parents, self.actions
+        explored = bytearray(self.height * self.width)
+        start = self.grid.index(self.start)
+        goal = self.grid.index(self.goal)
+        expand = self.expand
+
+        if self.algorithm == 1:
+            self.frontier = frontier = StackFrontier()
+        elif self.algorithm == 2:
+            self.frontier = frontier = QueueFrontier()
+
+        #DFS RE-PARENTS A QUEUED STATE WHEN IT IS PUSHED AGAIN (THE NEWEST COPY POPS
+        #FIRST), BFS KEEPS THE FIRST PARENT FOUND SINCE THAT COPY POPS FIRST
+        reparent = self.algorithm == 1
+
+        frontier.add(start)
+        self.phase('search')
+
+        while True:
+            if frontier.empty():
+                return None
+
+            for state in frontier.remove():
+
+                if goal == state:
+                    return self.backtrack(state, show_steps)
+
+                #ALREADY EXPANDED THROUGH ANOTHER COPY OF THIS STATE
+                if explored[state]:
+                    continue
+
+                explored[state] = 1
+                if visit is not None:
+                    visit(state, len(frontier.frontier))
+
+                #ONCE THE GOAL IS QUEUED THERE IS NO NEED TO GROW THE FRONTIER
+                if frontier.contains_state(goal):
+                    continue
+
+                for d, offset in expand(state):
+                    child = state + offset
+                    if not explored[child] and (reparent or parents[child] == NO_PARENT) and child != start:
+                        parents[child] = state
+                        actions[child] = d
+                        frontier.add(child)
+
+    #A* SEARCH WITH PER-CELL g-COSTS, A CLOSED SET AND LAZY DELETION OF STALE HEAP ENTRIES
+    def astar(self, show_steps):
+
+        visit = self.visit
+
+        self.reset_tree()
+        parents, actions = self.parents, self.actions
+        self.costs = costs = array('i', [UNREACHED_COST]) * (self.height * self.width)
+        closed = bytearray(self.height * self.width)
+        start = self.grid.index(self.start)
+        goal = self.grid.index(self.goal)
+        expand = self.expand
+
+        self.frontier = frontier = ManhattanFrontier(self.goal, self.width)
+        costs[start] = 0
+        frontier.add(start, 0)
+        self.phase('search')
+
+        while not frontier.empty():
+
+            state, = frontier.remove()
+
+            #STALE ENTRY, A CHEAPER COPY WAS ALREADY EXPANDED
+            if closed[state]:
+                continue
+
+            if goal == state:
+                return self.backtrack(state, show_steps)
+
+            closed[state] = 1
+            if visit is not None:
+                visit(state, len(frontier.frontier))
+
+            cost = costs[state] + 1
+            for d, offset in expand(state):
+                child = state + offset
+                if not closed[child] and cost < costs[child]:
+                    costs[child] = cost
+                    parents[child] = state
+                    actions[child] = d
+                    frontier.add(child, cost)
+
+        return None
+
+    #BIDIRECTIONAL BFS: GROWS ONE WHOLE LAYER AT A TIME FROM WHICHEVER SIDE HAS THE
+    #SMALLER FRONTIER AND STOPS AFTER THE FIRST LAYER THAT TOUCHES THE OTHER SIDE,
+    #KEEPING THE SHORTEST CONNECTION FOUND IN THAT LAYER
+    def bidirectional_bfs(self, show_steps):
+
+        visit = self.visit
+
+        self.reset_tree()
+        size = self.height * self.width
+        self.parents_back = array('i', [NO_PARENT]) * size
+        depths = (array('i', [UNREACHED_COST]) * size, array('i', [UNREACHED_COST]) * size)
+        trees = (self.parents, self.parents_back)
+        start = self.grid.index(self.start)
+        goal = self.grid.index(self.goal)
+        expand = self.expand
+        self.inserted = 1
+
+        if start == goal:
+            return self.backtrack(goal, show_steps)
+
+        depths[0][start] = 0
+        depths[1][goal] = 0
+        layers = [[start], [goal]]
+        self.inserted = 2
+        self.phase('search')
+
+        while layers[0] and layers[1]:
+
+            side = 0 if len(layers[0]) <= len(layers[1]) else 1
+            depth, tree, other = depths[side], trees[side], depths[1 - side]
+            best, meet = UNREACHED_COST, None
+            layer = []
+
+            for state in layers[side]:
+                if visit is not None:
+                    visit(state, len(layers[0]) + len(layers[1]) + len(layer))
+
+                for d, offset in expand(state):
+                    child = state + offset
+                    if other[child] != UNREACHED_COST and depth[state] + 1 + other[child] < best:
+                        best = depth[state] + 1 + other[child]
+                        meet = (state, child) if side == 0 else (child, state)
+                    if depth[child] == UNREACHED_COST:
+                        depth[child] = depth[state] + 1
+                        tree[child] = state
+                        layer.append(child)
+
+            if meet is not None:
+                return self.join(*meet, self.parents_back, show_steps)
+
+            layers[side] = layer
+            self.inserted += len(layer)
+
+        return None
+
+    #BIDIRECTIONAL A*: A FORWARD SEARCH TOWARDS THE GOAL AND A BACKWARD ONE TOWARDS THE
+    #START, EACH STEP EXPANDING THE SIDE WITH THE SMALLER HEAP. best IS THE SHORTEST
+    #start -> goal PATH SEEN WHERE THE TWO TREES TOUCH; NO SHORTER ONE CAN EXIST ONCE
+    #EITHER HEAP'S LOWEST f REACHES IT (THE MANHATTAN HEURISTIC IS CONSISTENT)
+    def bidirectional_astar(self, show_steps):
+
+        visit = self.visit
+
+        self.reset_tree()
+        size = self.height * self.width
+        self.parents_back = array('i', [NO_PARENT]) * size
+        self.costs = array('i', [UNREACHED_COST]) * size
+        self.side_costs = costs = (self.costs, array('i', [UNREACHED_COST]) * size)
+        closed = (bytearray(size), bytearray(size))
+        trees = (self.parents, self.parents_back)
+        start = self.grid.index(self.start)
+        goal = self.grid.index(self.goal)
+        expand = self.expand
+
+        self.frontiers = frontiers = (ManhattanFrontier(self.goal, self.width), ManhattanFrontier(self.start, self.width))
+        costs[0][start] = 0
+        frontiers[0].add(start, 0)
+        if start == goal:
+            return self.backtrack(goal, show_steps)
+        costs[1][goal] = 0
+        frontiers[1].add(goal, 0)
+        self.phase('search')
+        best, meet = UNREACHED_COST, None
+
+        while not frontiers[0].empty() and not frontiers[1].empty():
+
+            if max(frontiers[0].frontier[0][0], frontiers[1].frontier[0][0]) >= best:
+                break
+
+            side = 0 if len(frontiers[0].frontier) <= len(frontiers[1].frontier) else 1
+            cost_of, done, tree, other = costs[side], closed[side], trees[side], costs[1 - side]
+
+            state, = frontiers[side].remove()
+
+            #STALE ENTRY, A CHEAPER COPY WAS ALREADY EXPANDED
+            if done[state]:
+                continue
+
+            done[state] = 1
+            if visit is not None:
+                visit(state, len(frontiers[0].frontier) + len(frontiers[1].frontier))
+
+            cost = cost_of[state] + 1
+            for d, offset in expand(state):
+                child = state + offset
+                if other[child] != UNREACHED_COST and cost + other[child] < best:
+                    best = cost + other[child]
+                    meet = (state, child) if side == 0 else (child, state)
+                if not done[child] and cost < cost_of[child]:
+                    cost_of[child] = cost
+                    tree[child] = state
+                    frontiers[side].add(child, cost)
+
+        if meet is None:
+            return None
+        return self.join(*meet, self.parents_back, show_steps)
+
+    #A* OVER JUMP POINTS ONLY (SEE jps.py); parents[] LINKS JUMP POINTS UNTIL THE GOAL IS
+    #FOUND, THEN THE STRAIGHT RUNS BETWEEN THEM ARE FILLED IN CELL BY CELL
+    def jump_point_search(self, show_steps):
+
+        visit = self.visit
+
+        self.reset_tree()
+        parents = self.parents
+        self.costs = costs = array('i', [UNREACHED_COST]) * (self.height * self.width)
+        closed = bytearray(self.height * self.width)
+        start = self.grid.index(self.start)
+        goal = self.grid.index(self.goal)
+        walls, width = self.walls, self.width
+
+        self.frontier = frontier = ManhattanFrontier(self.goal, width)
+        costs[start] = 0
+        frontier.add(start, 0)
+        self.phase('search')
+
+        while not frontier.empty():
+
+            state, = frontier.remove()
+
+            #STALE ENTRY, A CHEAPER COPY WAS ALREADY EXPANDED
+            if closed[state]:
+                continue
+
+            if goal == state:
+                self.phase('path')
+                self.fill_runs(goal, start)
+                return self.backtrack(goal, show_steps)
+
+            closed[state] = 1
+            if visit is not None:
+                visit(state, len(frontier.frontier))
+
+            #JUMPS ARE STRAIGHT, SO THE INDEX DIFFERENCE GIVES THE LENGTH
+            for child in jps.successors(walls, width, goal, state, parents[state]):
+                length = abs(child - state)
+                cost = costs[state] + (length // width if length >= width else length)
+                if not closed[child] and cost < costs[child]:
+                    costs[child] = cost
+                    parents[child] = state
+                    frontier.add(child, cost)
+
+        return None
+
+    #TURN THE JUMP POINT CHAIN ENDING AT i INTO ONE PARENT PER CELL
+    def fill_runs(self, i, start):
+        parents, actions = self.parents, self.actions
+        while i != start:
+            jump = parents[i]
+            if (i - jump) % self.width == 0 and abs(i - jump) >= self.width:
+                step, d = (self.width, 1) if i > jump else (-self.width, 3)
+            else:
+                step, d = (1, 0) if i > jump else (-1, 2)
+            while i != jump:
+                parents[i] = i - step
+                actions[i] = d
+                i -= step
+
+    #WAVEFRONT BFS OVER A NUMPY WALL ARRAY; self.distances KEEPS THE DISTANCE FIELD
+    def flood(self, show_steps):
+
+        visit = self.visit
+        width = self.width
+
+        #A WHOLE WAVE IS EXPANDED AT ONCE, SO THE WAVE IS THE FRONTIER
+        def record(distance, wave):
+            rows, cols = np.nonzero(wave)
+            for i in (rows * width + cols).tolist():
+                visit(i, len(rows))
+
+        walls = self.grid.to_array()
+        self.phase('search')
+        self.distances = flood.distance_field(walls, self.start, self.goal, record if visit is not None else None)
+
+        self.phase('path')
+        moves = flood.backtrack(self.distances, self.start, self.goal)
+        if moves is None:
+            return None
+        if show_steps:
+            return (self.cells, moves)
+        else:
+            return moves
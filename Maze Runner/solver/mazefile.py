@@ -0,0 +1,89 @@
+#BINARY MAZE FILES (.maze)
+#A 32-byte little-endian header followed by the walls packed 8 cells per byte
+#(row-major, most significant bit first, 1 = wall, the last byte zero-padded),
+#so a 10k x 10k board takes 12.5 MB on disk:
+#
+#    magic     4s   b'MAZE'
+#    version   B    1
+#    flags     B    0 (reserved)
+#    reserved  H    0
+#    height, width, start row, start col, goal row, goal col   6 x uint32
+#
+#    save('big.maze', grid, start, goal)
+#    grid, start, goal = load('big.maze')
+#    moves = Maze(grid, ALGORITHMS['astar'], start, goal).solve(False)
+
+import mmap
+import struct
+
+import numpy as np
+
+from .grid import Grid
+
+MAGIC = b'MAZE'
+VERSION = 1
+HEADER = struct.Struct('<4sBBH6I')
+
+
+def save(path, board, start = None, goal = None):
+    grid = board if isinstance(board, Grid) else Grid.from_board(board)
+    start = (0,0) if start is None else tuple(start)
+    goal = (grid.height-1, grid.width-1) if goal is None else tuple(goal)
+    for state in (start, goal):
+        if not grid.in_bounds(state):
+            raise ValueError(f'{state} is outside the {grid.height}x{grid.width} board')
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0, grid.height, grid.width, *start, *goal))
+        f.write(grid.pack())
+
+
+#GRID BACKED BY A MEMORY-MAPPED .maze FILE
+#Opening one only reads the header. The walls stay packed in the mapping until
+#cells is first used, and are then unpacked straight from it in one NumPy pass
+#(no Python objects per cell). Until then pack() hands back the mapped bytes as
+#they are, so fingerprinting or sending the board to a worker never unpacks it;
+#once cells exists it may have been edited, so pack() packs it again instead.
+class MappedGrid(Grid):
+    def __init__(self, height, width, mapping, offset):
+        self.height = height
+        self.width = width
+        self.mapping = mapping
+        self.packed = memoryview(mapping)[offset:offset + (height * width + 7) // 8]
+        self.unpacked = None
+
+    @property
+    def cells(self):
+        if self.unpacked is None:
+            cells = bytearray(self.height * self.width)
+            np.frombuffer(cells, dtype = np.uint8)[:] = np.unpackbits(np.frombuffer(self.packed, dtype = np.uint8), count = len(cells))
+            self.unpacked = cells
+        return self.unpacked
+
+    def pack(self):
+        if self.unpacked is not None:
+            return Grid.pack(self)
+        return bytes(self.packed)
+
+
+#(MappedGrid, start, goal) FOR A .maze FILE; THE MAPPING IS READ-ONLY AND LIVES
+#AS LONG AS THE GRID
+def load(path):
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+
+    if len(mapping) < HEADER.size:
+        raise ValueError(f'{path} is too short to be a maze file')
+    magic, version, flags, reserved, height, width, sx, sy, gx, gy = HEADER.unpack_from(mapping, 0)
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not a maze file')
+    if version != VERSION:
+        raise ValueError(f'{path} is a version {version} maze file, expected version {VERSION}')
+    if len(mapping) < HEADER.size + (height * width + 7) // 8:
+        raise ValueError(f'{path} is truncated')
+
+    grid = MappedGrid(height, width, mapping, HEADER.size)
+    for state in ((sx, sy), (gx, gy)):
+        if not grid.in_bounds(state):
+            raise ValueError(f'{path}: {state} is outside the {height}x{width} board')
+    return grid, (sx, sy), (gx, gy)
@@ -0,0 +1,12 @@
+#NODE IN FRONTIER
+#Maze itself stores its search tree in flat parent/action/cost arrays; Node is
+#kept for callers that build their own trees. __slots__ drops the per-node
+#__dict__.
+class Node():
+    __slots__ = ('parent', 'state', 'action', 'cost')
+
+    def __init__(self, parent, state, action, cost = 0):
+        self.parent = parent #node
+        self.state = state #tuple or flat cell index (x * width + y)
+        self.action = action #tuple
+        self.cost = cost #int (steps taken from the start)
@@ -0,0 +1,172 @@
+#MANY QUERIES ON ONE MAZE
+#Preprocesses a static board once (adjacency masks and connected-component
+#labels) and then answers (start, goal) queries cheaply:
+#  - start and goal in different components: None without any search
+#  - an endpoint that already has a BFS tree: walk the tree, O(path length)
+#  - an endpoint seen tree_after times: grow a full BFS tree from it and keep
+#    it (up to max_trees, least recently used first out)
+#  - anything else: a one-off A* that only touches the cells it explores
+#Every answer is a shortest path in Maze.solve(False) form (moves excluding
+#the start and including the goal) or None. Start and goal must be open
+#cells; a query on a wall is unreachable.
+#
+#    queries = QuerySolver(board)
+#    for index, moves in queries.stream((start, goal) for ...):
+#        ...
+
+from array import array
+from collections import OrderedDict, deque
+
+from .frontiers import ManhattanFrontier
+from .grid import Grid, DOWN, RIGHT, UP, LEFT
+
+UNLABELLED = -1
+NO_PARENT = -1
+
+
+class QuerySolver():
+    def __init__(self, board, max_trees = 8, tree_after = 2):
+        self.grid = board if isinstance(board, Grid) else Grid.from_board(board)
+        self.height = self.grid.height
+        self.width = self.grid.width
+        self.max_trees = max_trees
+        self.tree_after = tree_after
+
+        #OPEN-NEIGHBOR INDEX OFFSETS FOR EVERY MASK VALUE, IN down/right/up/left ORDER
+        self.masks = self.grid.neighbor_masks()
+        offsets = ((DOWN, 1), (RIGHT, self.width), (UP, -1), (LEFT, -self.width))
+        self.steps = [tuple(offset for bit, offset in offsets if mask & bit) for mask in range(16)]
+
+        self.labels = self.label_components()
+        self.trees = OrderedDict()
+        self.uses = OrderedDict()
+
+    #COMPONENT NUMBER OF EVERY CELL (UNLABELLED FOR WALLS), ONE BFS PER COMPONENT
+    def label_components(self):
+        size = self.height * self.width
+        labels = array('i', [UNLABELLED]) * size
+        masks, steps = self.masks, self.steps
+
+        #WALLS START OUT DONE; find() SKIPS TO THE NEXT UNLABELLED OPEN CELL IN C
+        done = bytearray(self.grid.cells)
+        component = 0
+        i = done.find(0)
+        while i >= 0:
+            done[i] = 1
+            labels[i] = component
+            queue = deque([i])
+            while queue:
+                cell = queue.popleft()
+                for offset in steps[masks[cell]]:
+                    child = cell + offset
+                    if not done[child]:
+                        done[child] = 1
+                        labels[child] = component
+                        queue.append(child)
+            component += 1
+            i = done.find(0, i)
+        self.components = component
+        return labels
+
+    def index(self, state):
+        x,y = state
+        if not (0 <= x < self.height and 0 <= y < self.width):
+            raise ValueError(f'{state} is outside the {self.height}x{self.width} board')
+        return x * self.width + y
+
+    def connected(self, start, goal):
+        a, b = self.labels[self.index(start)], self.labels[self.index(goal)]
+        return a != UNLABELLED and a == b
+
+    #BFS PARENT OF EVERY CELL IN root'S COMPONENT (POINTING TOWARDS root)
+    def tree(self, root):
+        parents = self.trees.get(root)
+        if parents is not None:
+            self.trees.move_to_end(root)
+            return parents
+
+        parents = array('i', [NO_PARENT]) * (self.height * self.width)
+        masks, steps = self.masks, self.steps
+        parents[root] = root
+        queue = deque([root])
+        while queue:
+            cell = queue.popleft()
+            for offset in steps[masks[cell]]:
+                child = cell + offset
+                if parents[child] == NO_PARENT:
+                    parents[child] = cell
+                    queue.append(child)
+
+        self.trees[root] = parents
+        while len(self.trees) > self.max_trees:
+            self.trees.popitem(last = False)
+        return parents
+
+    #CELLS FROM i UP THE TREE TO ITS ROOT, BOTH INCLUDED
+    def climb(self, parents, i):
+        chain = [i]
+        while parents[i] != i:
+            i = parents[i]
+            chain.append(i)
+        return chain
+
+    #COUNT A QUERY ENDPOINT; TRUE ONCE IT HAS BEEN SEEN tree_after TIMES
+    def frequent(self, i):
+        count = self.uses.pop(i, 0) + 1
+        self.uses[i] = count
+        while len(self.uses) > 64 * self.max_trees:
+            self.uses.popitem(last = False)
+        return count >= self.tree_after
+
+    def solve(self, start, goal):
+        s, g = self.index(start), self.index(goal)
+        if self.labels[s] == UNLABELLED or self.labels[s] != self.labels[g]:
+            return None
+        if s == g:
+            return []
+
+        for frequent in (False, True):
+            if s in self.trees or (frequent and self.frequent(s)):
+                chain = self.climb(self.tree(s), g)
+                chain.reverse()
+                return [divmod(i, self.width) for i in chain[1:]]
+            if g in self.trees or (frequent and self.frequent(g)):
+                chain = self.climb(self.tree(g), s)
+                return [divmod(i, self.width) for i in chain[1:]]
+
+        return self.astar(s, g)
+
+    #ONE-OFF A* WITH DICTS, SO A SHORT QUERY NEVER PAYS FOR WHOLE-BOARD ARRAYS
+    def astar(self, start, goal):
+        masks, steps = self.masks, self.steps
+        costs = {start: 0}
+        parents = {start: start}
+        closed = set()
+        frontier = ManhattanFrontier(divmod(goal, self.width), self.width)
+        frontier.add(start, 0)
+
+        while not frontier.empty():
+            state, = frontier.remove()
+            if state in closed:
+                continue
+            if state == goal:
+                chain = self.climb(parents, goal)
+                chain.reverse()
+                return [divmod(i, self.width) for i in chain[1:]]
+            closed.add(state)
+
+            cost = costs[state] + 1
+            for offset in steps[masks[state]]:
+                child = state + offset
+                if child not in closed and cost < costs.get(child, cost + 1):
+                    costs[child] = cost
+                    parents[child] = state
+                    frontier.add(child, cost)
+
+        return None
+
+    #YIELDS (index, moves) FOR EACH (start, goal) IN queries AS IT IS READ, SO queries
+    #CAN BE AN ENDLESS GENERATOR
+    def stream(self, queries):
+        for index, (start, goal) in enumerate(queries):
+            yield index, self.solve(start, goal)
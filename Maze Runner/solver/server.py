@@ -0,0 +1,254 @@
+#ASYNCIO SOLVING SERVICE
+#Newline-delimited JSON over TCP or a Unix socket. One request per line:
+#
+#    {"id": 7, "rows": ["A.#", ".#.", "..B"], "algorithm": "astar", "deadline_ms": 250}
+#
+#"rows" uses the text maze format of cli.py. Large boards can instead send
+#"height", "width" and "walls" (base64 of Grid.pack(), one bit per cell).
+#"start" and "goal" ([row, col]) override the A/B markers and default to the
+#corners; "algorithm" is an ALGORITHMS name or id (default astar). Each
+#request gets exactly one reply line with the same id, in completion order:
+#
+#    {"id": 7, "moves": [[1, 0], [2, 0], [2, 1], [2, 2]]}   (null if unsolvable)
+#    {"id": 7, "error": "deadline exceeded"}
+#
+#Solves run on a process pool. Requests wait in a bounded queue; when it is
+#full the server stops reading from the sockets that are sending (TCP does
+#the rest), and each connection may only have per_connection requests in
+#flight. A batch is taken off the queue whenever a pool slot frees up, so
+#requests that arrive while the pool is busy go out together in one chunk.
+#Requests still queued at their deadline are dropped without being solved.
+#
+#    python -m solver.server --port 8765 --workers 4
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import pack_job, solve_packed
+from .cli import parse_rows
+from .maze import algorithm_id
+
+DEADLINE = 5.0
+LINE_LIMIT = 64 * 2**20
+
+
+#RUNS IN A WORKER: SOLVES A CHUNK OF PACKED JOBS, ONE BAD JOB DOES NOT FAIL THE OTHERS
+def solve_jobs(jobs):
+    results = []
+    for job in jobs:
+        try:
+            results.append((solve_packed(*job), None))
+        except Exception as error:
+            results.append((None, str(error)))
+    return results
+
+
+#THE JSON OBJECT ON ONE REQUEST LINE; ValueError IF IT IS NOT ONE
+def read_request(line):
+    try:
+        request = json.loads(line)
+    except ValueError:
+        raise ValueError('request is not valid JSON')
+    if not isinstance(request, dict):
+        raise ValueError('request must be a JSON object')
+    return request
+
+
+#request[name] AS AN (x, y) TUPLE, OR default IF IT IS MISSING OR null
+def parse_state(request, name, default):
+    state = request.get(name)
+    if state is None:
+        return default
+    #type() RATHER THAN isinstance(): JSON true AND false ARE bools, WHICH ARE ints TOO
+    if not (isinstance(state, list) and len(state) == 2 and all(type(value) is int for value in state)):
+        raise ValueError(f'"{name}" must be [row, col] with two integers')
+    return tuple(state)
+
+
+#(packed job, deadline in seconds) FOR A REQUEST OBJECT; ValueError OR TypeError IF IT IS MALFORMED
+def parse_request(request):
+    algorithm = algorithm_id(request.get('algorithm', 'astar'))
+
+    if 'rows' in request:
+        rows = request['rows']
+        if not (isinstance(rows, list) and all(isinstance(row, str) for row in rows)):
+            raise ValueError('"rows" must be a list of strings')
+        board, start, goal = parse_rows(rows)
+        height, width, data = pack_job((board, algorithm))[:3]
+    else:
+        try:
+            height, width = int(request['height']), int(request['width'])
+            data = base64.b64decode(request['walls'])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError('request needs "rows", or "height", "width" and "walls"')
+        if len(data) != (height * width + 7) // 8:
+            raise ValueError(f'"walls" must be {(height * width + 7) // 8} bytes for a {height}x{width} board')
+        start = goal = None
+
+    start = parse_state(request, 'start', start)
+    goal = parse_state(request, 'goal', goal)
+    for state in (start, goal):
+        if state is not None and not (0 <= state[0] < height and 0 <= state[1] < width):
+            raise ValueError(f'{list(state)} is outside the {height}x{width} board')
+
+    deadline = request.get('deadline_ms')
+    return (height, width, data, algorithm, start, goal), DEADLINE if deadline is None else deadline / 1000
+
+
+class Request():
+    def __init__(self, job, deadline, future):
+        self.job = job
+        self.deadline = deadline
+        self.future = future
+
+
+class SolveServer():
+    def __init__(self, workers = None, batch_size = 16, queue_size = 256, per_connection = 64):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.per_connection = per_connection
+        self.solved = 0
+        self.expired = 0
+        self.failed = 0
+
+    async def serve(self, host = '127.0.0.1', port = 8765, path = None, ready = None):
+        self.queue = asyncio.Queue(self.queue_size)
+        self.slots = asyncio.Semaphore(2 * self.workers)
+        with ProcessPoolExecutor(self.workers) as self.pool:
+            #START THE WORKERS BEFORE LISTENING: FORKED LATER THEY WOULD INHERIT CLIENT
+            #SOCKETS AND KEEP THEM OPEN AFTER THE SERVER CLOSES ITS END
+            await asyncio.get_running_loop().run_in_executor(self.pool, solve_jobs, [])
+            if path:
+                server = await asyncio.start_unix_server(self.handle, path, limit = LINE_LIMIT)
+            else:
+                server = await asyncio.start_server(self.handle, host, port, limit = LINE_LIMIT)
+            batcher = asyncio.create_task(self.batcher())
+            if ready is not None:
+                ready(server)
+            try:
+                async with server:
+                    await server.serve_forever()
+            finally:
+                batcher.cancel()
+
+    #TAKES WHATEVER IS QUEUED (UP TO batch_size) EACH TIME A POOL SLOT FREES UP
+    async def batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.slots.acquire()
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            now = loop.time()
+            live = [request for request in batch if request.deadline > now and not request.future.done()]
+            self.expired += len(batch) - len(live)
+            if not live:
+                self.slots.release()
+                continue
+
+            solving = loop.run_in_executor(self.pool, solve_jobs, [request.job for request in live])
+            solving.add_done_callback(lambda solving, live = live: self.finish(live, solving))
+
+    def finish(self, live, solving):
+        self.slots.release()
+        if solving.exception() is not None:
+            results = [(None, f'solver failed: {solving.exception()!r}')] * len(live)
+        else:
+            results = solving.result()
+        for request, result in zip(live, results):
+            self.solved += result[1] is None
+            self.failed += result[1] is not None
+            if not request.future.done():
+                request.future.set_result(result)
+
+    async def handle(self, reader, writer):
+        in_flight = asyncio.Semaphore(self.per_connection)
+        lock = asyncio.Lock()
+        replies = set()
+        try:
+            while True:
+                await in_flight.acquire()
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await self.reply(writer, lock, {'id': None, 'error': 'request line too long'})
+                    break
+                if not line:
+                    break
+                reply = asyncio.create_task(self.respond(line, writer, lock, in_flight))
+                replies.add(reply)
+                reply.add_done_callback(replies.discard)
+            if replies:
+                await asyncio.gather(*replies)
+        except ConnectionError:
+            pass
+        finally:
+            for reply in replies:
+                reply.cancel()
+            writer.close()
+
+    async def respond(self, line, writer, lock, in_flight):
+        loop = asyncio.get_running_loop()
+        try:
+            #A REQUEST THAT IS A JSON OBJECT GETS ITS id BACK EVEN IF THE REST IS INVALID. DECODING
+            #AND PACKING A BOARD IS LINEAR IN THE LINE (UP TO LINE_LIMIT), SO BOTH RUN ON A THREAD
+            #TO KEEP THE EVENT LOOP SERVING THE OTHER CONNECTIONS MEANWHILE
+            id = None
+            try:
+                request = await loop.run_in_executor(None, read_request, line)
+                id = request.get('id')
+                job, timeout = await loop.run_in_executor(None, parse_request, request)
+            except (ValueError, TypeError) as error:
+                await self.reply(writer, lock, {'id': id, 'error': f'bad request: {error}'})
+                return
+
+            deadline = loop.time() + timeout
+            request = Request(job, deadline, loop.create_future())
+            try:
+                await asyncio.wait_for(self.queue.put(request), max(deadline - loop.time(), 0))
+                moves, error = await asyncio.wait_for(request.future, max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                await self.reply(writer, lock, {'id': id, 'error': 'deadline exceeded'})
+                return
+
+            if error is not None:
+                await self.reply(writer, lock, {'id': id, 'error': error})
+            else:
+                await self.reply(writer, lock, {'id': id, 'moves': None if moves is None else [list(move) for move in moves]})
+        finally:
+            in_flight.release()
+
+    async def reply(self, writer, lock, message):
+        async with lock:
+            writer.write(json.dumps(message, separators = (',', ':')).encode() + b'\n')
+            await writer.drain()
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m solver.server', description = 'Serve maze solves over a local socket.')
+    parser.add_argument('--host', default = '127.0.0.1')
+    parser.add_argument('--port', type = int, default = 8765)
+    parser.add_argument('--unix', metavar = 'PATH', help = 'listen on a Unix socket instead of TCP')
+    parser.add_argument('--workers', type = int, help = 'solver processes (default: one per CPU)')
+    parser.add_argument('--batch', type = int, default = 16, help = 'most requests sent to a worker at once')
+    parser.add_argument('--queue', type = int, default = 256, help = 'requests waiting for a worker before reads pause')
+    parser.add_argument('--per-connection', type = int, default = 64, help = 'requests one connection may have in flight')
+    args = parser.parse_args(argv)
+
+    server = SolveServer(args.workers, args.batch, args.queue, args.per_connection)
+    where = args.unix or f'{args.host}:{args.port}'
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix, lambda _: print(f'Solving on {where} with {server.workers} workers', flush = True)))
+    except KeyboardInterrupt:
+        pass
+    print(f'{server.solved} solved, {server.failed} failed, {server.expired} expired')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#SOLVER INSTRUMENTATION
+#Pass a SolveStats to Maze.solve to get counters and per-phase timings back:
+#
+#    stats = SolveStats()
+#    Maze(board, ALGORITHMS['astar']).solve(False, stats = stats)
+#    stats.expanded, stats.generated, stats.requeued, stats.max_frontier
+#    stats.timings    ->  {'setup': ..., 'search': ..., 'path': ...}
+#
+#Without one (and without an on_expand hook or show_steps) the search loops
+#skip all of this; the only per-expansion cost is one `is not None` test.
+
+import time
+
+
+class SolveStats():
+    def __init__(self):
+        self.generated = 0      #FRONTIER INSERTIONS, INCLUDING THE START
+        self.expanded = 0       #CELLS TAKEN OFF THE FRONTIER AND EXPANDED
+        self.requeued = 0       #INSERTIONS OF A CELL THAT HAD ALREADY BEEN INSERTED
+        self.max_frontier = 0   #LARGEST FRONTIER SEEN AT AN EXPANSION
+        self.timings = {}
+        self.phase = None
+        self.began = None
+
+    #END THE CURRENT PHASE (IF ANY) AND START TIMING name
+    def enter(self, name):
+        now = time.perf_counter()
+        if self.phase is not None:
+            self.timings[self.phase] = self.timings.get(self.phase, 0.0) + now - self.began
+        self.phase, self.began = name, now
+
+    def stop(self):
+        self.enter(None)
+
+    def expand(self, frontier_size):
+        self.expanded += 1
+        if frontier_size > self.max_frontier:
+            self.max_frontier = frontier_size
+
+    def as_dict(self):
+        return {
+            'generated': self.generated,
+            'expanded': self.expanded,
+            'requeued': self.requeued,
+            'max_frontier': self.max_frontier,
+            'timings': dict(self.timings),
+        }
@@ -0,0 +1,96 @@
+#RANDOMIZED CROSS-CHECKS
+#Jump point search, HierarchicalPlanner and IncrementalPlanner against the
+#exact searches (flood fill or A*) on small random boards, with wall edits
+#between queries for the planners that keep state.
+#
+#    python -m pytest tests
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver import ALGORITHMS, IncrementalPlanner, Maze
+from solver.generators import backtracker, random_walls
+from solver.hierarchical import HierarchicalPlanner
+
+SEED = 2021
+DENSITIES = (0.0, 0.1, 0.25, 0.4)
+
+
+def random_cell(grid, rng):
+    return (rng.randrange(grid.height), rng.randrange(grid.width))
+
+
+#CHECK moves IS A WALK OF OPEN, ADJACENT CELLS FROM start TO goal
+def check_walk(grid, start, goal, moves):
+    cells = [start] + moves
+    for (x1,y1), (x2,y2) in zip(cells, cells[1:]):
+        assert abs(x1-x2) + abs(y1-y2) == 1
+        assert not grid.is_wall((x2,y2))
+    assert cells[-1] == goal
+
+
+def test_jps_matches_flood():
+    rng = random.Random(SEED)
+    for trial in range(500):
+        grid = random_walls(rng.randint(1, 20), rng.randint(1, 20), rng.choice(DENSITIES), seed = trial)
+        start, goal = random_cell(grid, rng), random_cell(grid, rng)
+        exact = Maze(grid, ALGORITHMS['flood'], start, goal).solve(False)
+        maze = Maze(grid, ALGORITHMS['jps'], start, goal)
+        moves = maze.solve(False)
+        assert (moves is None) == (exact is None)
+        if moves is not None:
+            assert len(moves) == len(exact)
+            check_walk(maze.grid, start, goal, moves)
+
+
+def test_hierarchical_matches_astar_after_edits():
+    rng = random.Random(SEED)
+    for trial in range(100):
+        height, width = rng.randint(1, 30), rng.randint(1, 30)
+        if trial % 3:
+            grid = random_walls(height, width, rng.choice(DENSITIES), seed = trial)
+        else:
+            grid = backtracker(height, width, seed = trial)
+        planner = HierarchicalPlanner(grid, rng.randint(1, 8))
+        for query in range(10):
+            if rng.random() < 0.4:
+                cell = random_cell(grid, rng)
+                planner.toggle(cell)
+                grid.set_wall(cell, not grid.is_wall(cell))
+
+            start, goal = random_cell(grid, rng), random_cell(grid, rng)
+            moves = planner.solve(start, goal)
+            if grid.is_wall(start) or grid.is_wall(goal):
+                assert moves is None
+                continue
+            exact = Maze(grid, ALGORITHMS['astar'], start, goal).solve(False)
+            assert (moves is None) == (exact is None)
+            if moves is not None:
+                #HPA* PATHS ARE VALID BUT MAY BE LONGER THAN THE SHORTEST ONE
+                assert len(moves) >= len(exact)
+                check_walk(grid, start, goal, moves)
+
+
+def test_incremental_matches_flood_after_edits():
+    rng = random.Random(SEED)
+    for trial in range(150):
+        grid = random_walls(rng.randint(1, 20), rng.randint(1, 20), rng.choice(DENSITIES), seed = trial)
+        start, goal = random_cell(grid, rng), random_cell(grid, rng)
+        planner = IncrementalPlanner(grid, start, goal)
+        grid = planner.grid.copy()
+        for edit in range(10):
+            moves = planner.solve()
+            exact = Maze(grid, ALGORITHMS['flood'], start, goal).solve(False)
+            assert (moves is None) == (exact is None)
+            if moves is not None:
+                assert len(moves) == len(exact)
+                check_walk(grid, start, goal, moves)
+
+            cell = random_cell(grid, rng)
+            if cell not in (start, goal):
+                wall = not grid.is_wall(cell)
+                grid.set_wall(cell, wall)
+                planner.set_wall(cell, wall)